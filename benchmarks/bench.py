@@ -0,0 +1,172 @@
+"""
+Офлайн-бенчмарк режимов парсера на сгенерированном снимке сайтов.
+
+    python benchmarks/bench.py
+    python benchmarks/bench.py --backends lxml bs4 --peps 200
+
+Каждый запуск режима выполняется в отдельном процессе, чтобы пиковое
+потребление памяти не смешивалось между способами разбора.
+Результаты сохраняются в benchmarks/results/bench_<дата>.json
+и сравниваются с предыдущим файлом.
+"""
+import argparse
+import contextlib
+import datetime as dt
+import importlib.util
+import io
+import json
+import platform
+import resource
+import sys
+import time
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BENCH_DIR.parent / 'src'))
+
+import requests
+
+import extractors
+import main
+from constants import BACKENDS, CONCURRENCY, DATETIME_FORMAT, WORKERS
+from corpus import generate_corpus
+from transport import ReplayAdapter
+
+
+RESULTS_DIR = BENCH_DIR / 'results'
+MODES = ('whats-new', 'latest-versions', 'pep')
+MODE_EXTRACTORS = {
+    'whats-new': extractors.VERSION_INFO_EXTRACTORS,
+    'pep': extractors.PEP_STATUS_EXTRACTORS,
+}
+ROW_FORMAT = '{:<16} {:<12} {:>6} {:>9} {:>11} {:>11} {:>10}'
+HEAD = ('mode', 'backend', 'pages', 'pages/s', 'parse ms/p', 'peak RSS K',
+        'vs prev')
+
+
+class CountingReplayAdapter(ReplayAdapter):
+
+    requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        return super().send(request, **kwargs)
+
+
+def _timed(extractor, durations):
+    def timed_extractor(response):
+        start = time.perf_counter()
+        try:
+            return extractor(response)
+        finally:
+            durations.append(time.perf_counter() - start)
+    return timed_extractor
+
+
+def run_mode(mode, backend, corpus_options, concurrency, workers):
+    """Один запуск режима; выполняется в отдельном процессе."""
+    pages = generate_corpus(**corpus_options)
+    session = requests.Session()
+    adapter = CountingReplayAdapter(pages)
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    durations = []
+    # В пуле процессов время разбора страницы здесь не измерить
+    if mode in MODE_EXTRACTORS and not workers:
+        extractors_map = MODE_EXTRACTORS[mode]
+        extractors_map[backend] = _timed(extractors_map[backend], durations)
+    cli_args = Namespace(
+        backend=backend, concurrency=concurrency, parse_store=False,
+        workers=workers
+    )
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        main.MODE_TO_FUNCTION[mode](session, cli_args)
+    seconds = time.perf_counter() - start
+    return {
+        'mode': mode,
+        'backend': backend,
+        'pages': adapter.requests,
+        'seconds': round(seconds, 4),
+        'pages_per_sec': round(adapter.requests / seconds, 2),
+        'parse_ms_per_page': (
+            round(sum(durations) / len(durations) * 1000, 3)
+            if durations else None
+        ),
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def backend_available(backend):
+    return (
+        backend != 'html5lib'
+        or importlib.util.find_spec('html5lib') is not None
+    )
+
+
+def previous_results():
+    files = sorted(RESULTS_DIR.glob('bench_*.json'))
+    if not files:
+        return {}
+    return {
+        (result['mode'], result['backend']): result
+        for result in json.loads(files[-1].read_text())['results']
+    }
+
+
+def compare(result, previous):
+    before = previous.get((result['mode'], result['backend']))
+    if before is None:
+        return '-'
+    return f"{result['pages_per_sec'] / before['pages_per_sec']:.2f}x"
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(description='Бенчмарк парсера')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS,
+                        default=list(BACKENDS))
+    parser.add_argument('--modes', nargs='+', choices=MODES,
+                        default=list(MODES))
+    parser.add_argument('--peps', type=int, default=700)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    return parser
+
+
+def main_bench():
+    args = configure_argument_parser().parse_args()
+    corpus_options = {'pep_count': args.peps}
+    previous = previous_results()
+    results = []
+    print(ROW_FORMAT.format(*HEAD))
+    for backend in filter(backend_available, args.backends):
+        for mode in args.modes:
+            # Новый процесс на каждый запуск - честный пик памяти
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(
+                    run_mode, mode, backend, corpus_options, args.concurrency,
+                    args.workers
+                ).result()
+            results.append(result)
+            print(ROW_FORMAT.format(
+                mode, backend, result['pages'], result['pages_per_sec'],
+                result['parse_ms_per_page'] or '-', result['peak_rss_kb'],
+                compare(result, previous)
+            ))
+    RESULTS_DIR.mkdir(exist_ok=True)
+    now_formatted = dt.datetime.now().strftime(DATETIME_FORMAT)
+    file_path = RESULTS_DIR / f'bench_{now_formatted}.json'
+    file_path.write_text(json.dumps({
+        'created': now_formatted,
+        'python': platform.python_version(),
+        'corpus': corpus_options,
+        'workers': args.workers,
+        'results': results,
+    }, indent=2))
+    print(f'Результаты сохранены: {file_path}')
+
+
+if __name__ == '__main__':
+    main_bench()
@@ -0,0 +1,130 @@
+"""
+Генерация HTML-снимков docs.python.org и peps.python.org для бенчмарков.
+Структура страниц повторяет разметку, которую разбирают режимы парсера,
+объём - близок к настоящим страницам.
+"""
+from urllib.parse import urljoin
+
+from constants import MAIN_DOC_URL, MAIN_PEP_URL
+
+
+PARAGRAPH = (
+    '<p>Lorem ipsum dolor sit amet, <a href="#x">consectetur</a> adipiscing '
+    'elit, <code class="docutils literal">sed do eiusmod</code> tempor '
+    'incididunt ut labore et dolore magna aliqua.</p>\n'
+)
+PEP_TYPES = ('S', 'I', 'P')
+PEP_STATUSES = (
+    ('F', 'Final'), ('A', 'Accepted'), ('R', 'Rejected'), ('W', 'Withdrawn'),
+    ('D', 'Deferred'), ('S', 'Superseded'), ('', 'Draft'), ('A', 'Active'),
+)
+VERSIONS = ('3.13', '3.12', '3.11', '3.10', '3.9', '3.8', '3.7', '3.6')
+
+
+def _page(title, body):
+    return (
+        '<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+        f'<title>{title}</title></head><body>\n'
+        '<div class="related"><ul><li><a href="/">Python</a></li></ul></div>'
+        f'\n{body}\n</body></html>\n'
+    )
+
+
+def main_doc_page():
+    items = ''.join(
+        f'<li><a href="https://docs.python.org/{version}/">'
+        f'Python {version} (stable)</a></li>'
+        for version in VERSIONS
+    )
+    return _page('Python documentation', (
+        '<div class="sphinxsidebar"><div class="sphinxsidebarwrapper">'
+        f'<ul>{items}<li><a href="https://www.python.org/doc/versions/">'
+        'All versions</a></li></ul></div></div>'
+        + PARAGRAPH * 20
+    ))
+
+
+def whats_new_index():
+    items = ''.join(
+        f'<li class="toctree-l1"><a class="reference internal" '
+        f'href="{version}.html">What\'s New In Python {version}</a></li>'
+        for version in VERSIONS
+    )
+    return _page("What's New in Python", (
+        '<section id="what-s-new-in-python"><h1>What\'s New in Python</h1>'
+        f'<div class="toctree-wrapper compound"><ul>{items}</ul></div>'
+        '</section>'
+    ))
+
+
+def whats_new_page(version, paragraphs):
+    return _page(f"What's New In Python {version}", (
+        f'<section><h1>What\'s New In Python {version}'
+        '<a class="headerlink" href="#">¶</a></h1>\n'
+        '<dl class="field-list simple">\n'
+        '<dt class="field-odd">Editor<span class="colon">:</span></dt>\n'
+        '<dd class="field-odd"><p>Guido van Rossum</p>\n</dd>\n</dl>\n'
+        + PARAGRAPH * paragraphs + '</section>'
+    ))
+
+
+def pep_index(pep_count):
+    rows = []
+    for number in range(pep_count):
+        letter, _ = PEP_STATUSES[number % len(PEP_STATUSES)]
+        kind = PEP_TYPES[number % len(PEP_TYPES)]
+        rows.append(
+            f'<tr><td><abbr title="">{kind}{letter}</abbr></td>'
+            f'<td><a class="pep reference internal" '
+            f'href="pep-{number:04d}/">{number}</a></td>'
+            f'<td><a href="pep-{number:04d}/">PEP title {number}</a></td>'
+            '<td>Guido van Rossum, Barry Warsaw</td></tr>\n'
+        )
+    return _page('PEP 0 -- Index of Python Enhancement Proposals', (
+        '<section id="numerical-index"><h2>Numerical Index</h2>'
+        '<table class="pep-zero-table docutils"><thead><tr><th>Type</th>'
+        '<th>PEP</th><th>Title</th><th>Authors</th></tr></thead><tbody>\n'
+        + ''.join(rows) + '</tbody></table></section>'
+    ))
+
+
+def pep_page(number, paragraphs):
+    _, status = PEP_STATUSES[number % len(PEP_STATUSES)]
+    fields = (
+        ('Author', 'Guido van Rossum'), ('Status', status),
+        ('Type', 'Standards Track'), ('Created', '01-Jan-2001'),
+    )
+    dl = ''.join(
+        f'<dt class="field-odd">{name}<span class="colon">:</span></dt>\n'
+        f'<dd class="field-odd">{value}</dd>\n'
+        for name, value in fields
+    )
+    return _page(f'PEP {number}', (
+        f'<section id="pep-content"><h1 class="page-title">PEP {number}</h1>'
+        f'\n<dl class="rfc2822 field-list simple">\n{dl}</dl>\n'
+        + PARAGRAPH * paragraphs + '</section>'
+    ))
+
+
+def generate_corpus(pep_count=700, pep_paragraphs=60,
+                    whats_new_paragraphs=600):
+    """Снимок сайта: URL -> (статус, заголовки, тело в bytes)."""
+    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+    pages = {
+        MAIN_DOC_URL: main_doc_page(),
+        whats_new_url: whats_new_index(),
+        MAIN_PEP_URL: pep_index(pep_count),
+    }
+    for version in VERSIONS:
+        pages[urljoin(whats_new_url, f'{version}.html')] = whats_new_page(
+            version, whats_new_paragraphs
+        )
+    for number in range(pep_count):
+        pages[urljoin(MAIN_PEP_URL, f'pep-{number:04d}/')] = pep_page(
+            number, pep_paragraphs
+        )
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+    return {
+        url: (200, headers, text.encode('utf-8'))
+        for url, text in pages.items()
+    }
@@ -0,0 +1,247 @@
+import sqlite3
+import time
+import zlib
+from collections import Counter
+from contextlib import closing
+from pathlib import Path
+from threading import Lock
+from urllib.parse import urlsplit
+
+from requests_cache import CachedSession
+from requests_cache.serializers import (SerializerPipeline, Stage,
+                                        pickle_serializer)
+
+from constants import (CACHE_COMPRESSION, CACHE_MAX_RESPONSE_SIZE,
+                       CACHE_NAME, CACHE_SIZE, CACHEABLE_CONTENT_TYPES,
+                       MEGABYTE)
+
+
+USAGE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS usage (
+    key TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS host_stats (
+    host TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL,
+    misses INTEGER NOT NULL
+);
+'''
+UPSERT_USAGE = 'INSERT OR REPLACE INTO usage VALUES (?, ?, ?)'
+UPSERT_HOST_STATS = (
+    'INSERT INTO host_stats VALUES (?, ?, ?) ON CONFLICT (host) DO UPDATE '
+    'SET hits = hits + excluded.hits, misses = misses + excluded.misses'
+)
+# Ответы от давно не использованных к недавним
+SELECT_LRU = (
+    'SELECT responses.key, length(responses.value) FROM responses '
+    'LEFT JOIN usage ON usage.key = responses.key '
+    'ORDER BY COALESCE(usage.accessed, 0)'
+)
+SELECT_HOST_SIZES = (
+    'SELECT usage.host, COUNT(*), SUM(length(responses.value)) '
+    'FROM responses LEFT JOIN usage ON usage.key = responses.key '
+    'GROUP BY usage.host'
+)
+SELECT_HOST_STATS = 'SELECT host, hits, misses FROM host_stats'
+UNKNOWN_HOST = '-'
+CACHE_STATS_HEAD = (
+    'Хост', 'Записей', 'Байт', 'Попаданий', 'Промахов', 'Доля попаданий'
+)
+CACHE_PRUNE_HEAD = ('Удалено записей', 'Освобождено байт', 'Размер кеша')
+CACHE_TOTAL = 'Всего'
+# Заголовок потока zlib; ответы, сохранённые без сжатия, начинаются
+# с заголовка pickle и читаются как есть
+ZLIB_HEADER = b'\x78'
+
+
+def cache_path():
+    return Path(f'{CACHE_NAME}.sqlite')
+
+
+def _decompress(data):
+    if data[:1] != ZLIB_HEADER:
+        return data
+    return zlib.decompress(data)
+
+
+def compressed_serializer():
+    """Сериализатор requests-cache по умолчанию со сжатием zlib."""
+    return SerializerPipeline([
+        *pickle_serializer.stages,
+        Stage(
+            dumps=lambda data: zlib.compress(data, CACHE_COMPRESSION),
+            loads=_decompress
+        ),
+    ], name='pickle+zlib', is_binary=True)
+
+
+def is_cacheable(response):
+    """
+    В кеш попадают только текстовые ответы не больше
+    CACHE_MAX_RESPONSE_SIZE; архивы и другие большие файлы - нет.
+    Решение принимается по заголовкам, тело ответа не читается.
+    """
+    content_type = response.headers.get('Content-Type', 'text/html')
+    if not content_type.startswith(CACHEABLE_CONTENT_TYPES):
+        return False
+    length = response.headers.get('Content-Length')
+    return length is None or int(length) <= CACHE_MAX_RESPONSE_SIZE
+
+
+class CacheUsage:
+    """
+    Обращения к кешу за запуск: время последнего обращения к записи
+    и попадания по хостам. Сохраняются в файл кеша одной транзакцией.
+    """
+
+    def __init__(self):
+        self.accessed = {}
+        self.hits = Counter()
+        self.misses = Counter()
+        self._lock = Lock()
+
+    def record(self, response):
+        key = getattr(response, 'cache_key', None)
+        host = urlsplit(response.url).hostname or UNKNOWN_HOST
+        with self._lock:
+            if key is not None:
+                self.accessed[key] = (host, time.time())
+            if getattr(response, 'from_cache', False):
+                self.hits[host] += 1
+            else:
+                self.misses[host] += 1
+
+    def save(self, path=None):
+        with self._lock:
+            accessed, self.accessed = self.accessed, {}
+            hosts = self.hits.keys() | self.misses.keys()
+            host_stats = [
+                (host, self.hits[host], self.misses[host]) for host in hosts
+            ]
+            self.hits, self.misses = Counter(), Counter()
+        with closing(connect(path)) as connection, connection:
+            connection.executemany(UPSERT_USAGE, (
+                (key, host, accessed_at)
+                for key, (host, accessed_at) in accessed.items()
+            ))
+            connection.executemany(UPSERT_HOST_STATS, host_stats)
+
+
+class UsageTrackingSession(CachedSession):
+    """
+    Кеширующая сессия, учитывающая обращения к кешу.
+    При закрытии обращения сохраняются в файл кеша, а кеш сокращается
+    до max_size байт удалением давно не использованных ответов.
+    """
+
+    def __init__(self, *args, max_size=CACHE_SIZE * MEGABYTE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.usage = CacheUsage()
+        self.max_size = max_size
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if not self.settings.disabled:
+            self.usage.record(response)
+        return response
+
+    def close(self):
+        try:
+            path = getattr(
+                getattr(self.cache, 'responses', None), 'db_path', None
+            )
+            if path is not None and Path(path).exists():
+                self.usage.save(path)
+                prune(self.max_size, path)
+        finally:
+            super().close()
+
+
+def connect(path=None):
+    connection = sqlite3.connect(str(path or cache_path()))
+    connection.executescript(USAGE_SCHEMA)
+    return connection
+
+
+def _has_responses(connection):
+    return connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+        "AND name = 'responses'"
+    ).fetchone() is not None
+
+
+def prune(max_size, path=None):
+    """
+    Удаление давно не использованных ответов, пока кеш больше max_size
+    байт. Возвращает количество удалённых записей, освобождённые байты
+    и оставшийся размер ответов в кеше.
+    """
+    path = path or cache_path()
+    if not Path(path).exists():
+        return 0, 0, 0
+    with closing(connect(path)) as connection:
+        if not _has_responses(connection):
+            return 0, 0, 0
+        rows = connection.execute(SELECT_LRU).fetchall()
+        size = sum(row_size for _, row_size in rows)
+        removed = []
+        freed = 0
+        for key, row_size in rows:
+            if size - freed <= max_size:
+                break
+            removed.append((key,))
+            freed += row_size
+        if not removed:
+            return 0, 0, size
+        with connection:
+            connection.executemany(
+                'DELETE FROM responses WHERE key = ?', removed
+            )
+            connection.executemany(
+                'DELETE FROM redirects WHERE value = ?', removed
+            )
+            connection.executemany('DELETE FROM usage WHERE key = ?', removed)
+        # Возвращаем освобождённое место файлу кеша
+        connection.execute('VACUUM')
+    return len(removed), freed, size - freed
+
+
+def cache_stats_rows(cli_args=None, path=None):
+    """Записи, объём и доля попаданий в кеш по хостам."""
+    path = path or cache_path()
+    sizes, stats = [], {}
+    if Path(path).exists():
+        with closing(connect(path)) as connection:
+            if _has_responses(connection):
+                sizes = connection.execute(SELECT_HOST_SIZES).fetchall()
+            stats = {
+                host: (hits, misses) for host, hits, misses
+                in connection.execute(SELECT_HOST_STATS)
+            }
+    yield CACHE_STATS_HEAD
+    hosts = {host or UNKNOWN_HOST: (entries, size)
+             for host, entries, size in sizes}
+    totals = [0, 0, 0, 0]
+    for host in sorted(hosts.keys() | stats.keys()):
+        entries, size = hosts.get(host, (0, 0))
+        hits, misses = stats.get(host, (0, 0))
+        totals = [
+            total + value for total, value
+            in zip(totals, (entries, size, hits, misses))
+        ]
+        yield (host, entries, size, hits, misses, _ratio(hits, misses))
+    yield (CACHE_TOTAL, *totals, _ratio(*totals[2:]))
+
+
+def cache_prune_rows(cli_args, path=None):
+    """Сокращение кеша до --cache-size мегабайт."""
+    yield CACHE_PRUNE_HEAD
+    yield prune(cli_args.cache_size * MEGABYTE, path)
+
+
+def _ratio(hits, misses):
+    if not hits + misses:
+        return '-'
+    return f'{hits / (hits + misses):.0%}'
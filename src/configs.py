@@ -1,9 +1,17 @@
 import argparse
 import logging
-from logging.handlers import RotatingFileHandler
+from datetime import timedelta
+from pathlib import Path
 
-from constants import (BASE_DIR, DT_FORMAT, FILE_OUTPUT, LOG_DIR, LOG_FILENAME,
-                       LOG_FORMAT, PRETTY_OUTPUT)
+from constants import (BACKENDS, BASE_DIR, CACHE_NAME, CACHE_SIZE, CONCURRENCY,
+                       DEFAULT_EXPIRE_AFTER, DT_FORMAT, FILE_OUTPUT, HOST_RATE,
+                       JSONL_OUTPUT, LOG_DIR, LOG_FILENAME, LOG_FORMAT,
+                       LOG_LEVEL, LOG_LEVELS, MEGABYTE, MODE_EXPIRE_AFTER,
+                       PEP_SOURCE, PEP_SOURCES, PRETTY_OUTPUT, SERVE_HOST,
+                       SERVE_MODE, SERVE_PORT, SERVE_REFRESH, SQLITE_OUTPUT,
+                       TABLE_COLUMN_WIDTH, TABLE_OUTPUT, URLS_EXPIRE_AFTER,
+                       WORKERS)
+from peps import INDEXED_FIELDS
 
 
 def configure_argument_parser(available_modes):
@@ -11,6 +19,7 @@ def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
         'mode',
+        nargs='+',
         choices=available_modes,
         help='Режимы работы парсера'
     )
@@ -23,24 +32,288 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=(PRETTY_OUTPUT, FILE_OUTPUT),
+        choices=(
+            PRETTY_OUTPUT, FILE_OUTPUT, SQLITE_OUTPUT, JSONL_OUTPUT,
+            TABLE_OUTPUT
+        ),
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '--log-level',
+        choices=LOG_LEVELS,
+        default=LOG_LEVEL,
+        help='Уровень логирования (DEBUG - строка на каждую страницу)'
+    )
+    parser.add_argument(
+        '--log-json',
+        action='store_true',
+        help='Логи в формате JSON, запись на строку'
+    )
+    parser.add_argument(
+        '--diff',
+        action='store_true',
+        help='Вывести только строки, изменившиеся с прошлого запуска'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=CONCURRENCY,
+        metavar='N',
+        help='Наибольшее количество одновременных запросов к хосту'
+    )
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=HOST_RATE,
+        metavar='RPS',
+        help='Запросов в секунду к одному хосту (0 - без ограничения)'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=CACHE_SIZE,
+        metavar='MB',
+        help='Наибольший размер HTTP-кеша'
+    )
+    parser.add_argument(
+        '--expire-after',
+        type=int,
+        metavar='SECONDS',
+        help='Срок жизни кеша страниц режима (-1 - бессрочно)'
+    )
+    parser.add_argument(
+        '--stale-while-revalidate',
+        type=int,
+        metavar='SECONDS',
+        help='Сколько отдавать устаревший кеш, обновляя его в фоне'
+    )
+    parser.add_argument(
+        '--no-parse-store',
+        action='store_false',
+        dest='parse_store',
+        help='Разбирать страницы заново, не используя сохранённые результаты'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=BACKENDS,
+        help='Способ извлечения данных со страниц'
+    )
+    parser.add_argument(
+        '--source',
+        choices=PEP_SOURCES,
+        default=PEP_SOURCE,
+        help='Источник статусов PEP: карточки PEP или индекс PEP в JSON'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Профилирование cProfile и tracemalloc'
+    )
+    parser.add_argument(
+        '--low-memory',
+        action='store_true',
+        help='Потоковый разбор индекса PEP и ограниченная очередь страниц'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Читать страницы PEP и статей только до нужных тегов'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=WORKERS,
+        metavar='N',
+        help='Количество процессов для разбора страниц'
+    )
+    parser.add_argument(
+        '--no-pep-index',
+        action='store_false',
+        dest='pep_index',
+        help='Не сохранять записи PEP для режима query'
+    )
+    query = parser.add_argument_group('Режим query')
+    query.add_argument(
+        '--number',
+        type=int,
+        help='Номер PEP'
+    )
+    query.add_argument(
+        '--status',
+        help='Статус PEP из карточки'
+    )
+    query.add_argument(
+        '--type',
+        help='Тип PEP'
+    )
+    query.add_argument(
+        '--author',
+        help='Автор PEP'
+    )
+    query.add_argument(
+        '--group-by',
+        choices=INDEXED_FIELDS,
+        help='Количество PEP по значениям поля'
+    )
+    table = parser.add_argument_group('Вывод в терминал')
+    table.add_argument(
+        '--limit',
+        type=int,
+        metavar='N',
+        help='Вывести не больше N строк результата'
+    )
+    table.add_argument(
+        '--page-size',
+        type=int,
+        metavar='N',
+        help='Строк на страницу таблицы -o table, заголовок на каждой'
+    )
+    table.add_argument(
+        '--max-width',
+        type=int,
+        default=TABLE_COLUMN_WIDTH,
+        metavar='N',
+        help='Наибольшая ширина столбца таблицы -o table'
+    )
+    table.add_argument(
+        '--pager',
+        action='store_true',
+        help='Вывод таблицы -o table через пейджер ($PAGER или less)'
+    )
+    serve = parser.add_argument_group('Режим serve')
+    serve.add_argument(
+        '--host',
+        default=SERVE_HOST,
+        help='Адрес сервиса'
+    )
+    serve.add_argument(
+        '--port',
+        type=int,
+        default=SERVE_PORT,
+        help='Порт сервиса'
+    )
+    serve.add_argument(
+        '--refresh',
+        type=int,
+        default=SERVE_REFRESH,
+        metavar='SECONDS',
+        help='Период фонового обновления результатов'
+    )
+    snapshot = parser.add_mutually_exclusive_group()
+    snapshot.add_argument(
+        '--record',
+        type=Path,
+        metavar='PATH',
+        help='Сохранить все загруженные страницы в снимок'
+    )
+    snapshot.add_argument(
+        '--replay',
+        type=Path,
+        metavar='PATH',
+        help='Работать без сети по сохранённому снимку'
+    )
     return parser
 
 
-def configure_logging():
-    """Логгер с выводом сообщений в терминал."""
+def configure_logging(cli_args=None):
+    """
+    Логгер с выводом сообщений в терминал и файл.
+    Потоки парсера только кладут записи в очередь, форматирование
+    и запись на диск выполняет поток QueueListener.
+    Возвращает запущенного слушателя, его нужно остановить в конце работы.
+    """
+    from logging.handlers import QueueListener, RotatingFileHandler
+    from queue import SimpleQueue
+
+    from logger import JsonFormatter, LocalQueueHandler
+
     log_dir = BASE_DIR / LOG_DIR
     log_dir.mkdir(exist_ok=True)
     log_file = log_dir / LOG_FILENAME
     rotating_handler = RotatingFileHandler(
         log_file, maxBytes=10 ** 6, backupCount=5, encoding='utf-8'
     )
+    # Вывод логов в терминал
+    stream_handler = logging.StreamHandler()
+    if getattr(cli_args, 'log_json', False):
+        formatter = JsonFormatter(datefmt=DT_FORMAT)
+    else:
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=DT_FORMAT)
+    for handler in (rotating_handler, stream_handler):
+        handler.setFormatter(formatter)
+    log_queue = SimpleQueue()
+    listener = QueueListener(log_queue, rotating_handler, stream_handler)
     logging.basicConfig(
-        datefmt=DT_FORMAT,
-        format=LOG_FORMAT,
-        level=logging.INFO,
-        # Вывод логов в терминал
-        handlers=(rotating_handler, logging.StreamHandler())
+        level=getattr(cli_args, 'log_level', LOG_LEVEL),
+        handlers=(LocalQueueHandler(log_queue),)
+    )
+    listener.start()
+    return listener
+
+
+def mode_expire_after(cli_args, mode):
+    """Срок жизни кеша страниц режима."""
+    if mode == SERVE_MODE:
+        # Страницы перепроверяются при каждом фоновом обновлении сервиса
+        return timedelta(
+            seconds=getattr(cli_args, 'refresh', None) or SERVE_REFRESH
+        )
+    return MODE_EXPIRE_AFTER.get(mode, DEFAULT_EXPIRE_AFTER)
+
+
+def configure_session(cli_args):
+    """
+    Кеширующая сессия с политикой срока жизни для режима.
+    Устаревшие записи перепроверяются по ETag/Last-Modified.
+    При записи снимка кеш не используется, при воспроизведении
+    страницы отдаются из снимка.
+    """
+    # Сеть и кеш нужны только режимам, а не разбору аргументов
+    import requests
+
+    from cache import UsageTrackingSession, compressed_serializer, is_cacheable
+    from snapshot import SnapshotReader, mount_recording
+    from transport import mount_replay, mount_transport
+
+    if getattr(cli_args, 'replay', None) is not None:
+        session = requests.Session()
+        mount_replay(session, SnapshotReader(cli_args.replay))
+        return session
+    expire_after = cli_args.expire_after
+    if expire_after is None:
+        # Для нескольких режимов - самый короткий срок
+        expire_after = min(
+            mode_expire_after(cli_args, mode) for mode in cli_args.mode
+        )
+    urls_expire_after = URLS_EXPIRE_AFTER
+    if SERVE_MODE in cli_args.mode:
+        # Сервис обновляет все страницы, в том числе страницы PEP
+        refresh = mode_expire_after(cli_args, SERVE_MODE)
+        urls_expire_after = {
+            pattern: min(expire, refresh)
+            for pattern, expire in URLS_EXPIRE_AFTER.items()
+        }
+    stale_while_revalidate = cli_args.stale_while_revalidate
+    session = UsageTrackingSession(
+        CACHE_NAME,
+        serializer=compressed_serializer(),
+        filter_fn=is_cacheable,
+        max_size=getattr(cli_args, 'cache_size', CACHE_SIZE) * MEGABYTE,
+        expire_after=expire_after,
+        urls_expire_after=urls_expire_after,
+        stale_if_error=True,
+        stale_while_revalidate=(
+            False if stale_while_revalidate is None
+            else timedelta(seconds=stale_while_revalidate)
+        ),
     )
+    if getattr(cli_args, 'record', None) is not None:
+        session.settings.disabled = True
+        mount_recording(
+            session, cli_args.record, cli_args.concurrency, cli_args.rate
+        )
+    else:
+        mount_transport(session, cli_args.concurrency, cli_args.rate)
+    if cli_args.clear_cache:
+        session.cache.clear()
+    return session
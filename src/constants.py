@@ -1,13 +1,71 @@
+from datetime import timedelta
 from pathlib import Path
 
 
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 MAIN_PEP_URL = 'https://peps.python.org/'
+# Индекс PEP в JSON: номер, название, авторы, тип и статус каждого PEP
+PEP_API_URL = 'https://peps.python.org/api/peps.json'
+
+CONCURRENCY = 10
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+RETRIES = 5
+BACKOFF_FACTOR = 0.5
+BACKOFF_JITTER = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Ограничение запросов к одному хосту
+HOST_RATE = 20.0
+HOST_BURST = 10
+INITIAL_CONCURRENCY = 2
+THROTTLE_STATUSES = (429, 503)
+AIMD_DECREASE = 0.5
+LATENCY_SMOOTHING = 0.2
+LATENCY_TOLERANCE = 3.0
+# Базовая задержка - наименьшая из последних LATENCY_WINDOW ответов
+LATENCY_WINDOW = 50
+DOWNLOAD_CHUNK_SIZE = 2 ** 16
+# Фрагмент потокового чтения страницы до нужных тегов (--stream)
+STREAM_CHUNK_SIZE = 2 ** 13
+# Теги, после закрытия первых из которых страница режима не дочитывается
+MODE_STREAM_TAGS = {
+    'whats-new': ('h1', 'dl'),
+    'pep': ('dl',),
+}
+SNAPSHOT_COMPRESSION = 6
+# Процессы для разбора страниц, 0 - разбор в основном процессе
+WORKERS = 0
+# Страниц в очереди на разбор на один процесс
+PARSE_WINDOW = 4
+# В режиме --low-memory загруженных, но не разобранных страниц
+# не больше LOW_MEMORY_WINDOW на одно соединение
+LOW_MEMORY_WINDOW = 2
+
+BS4_BACKEND = 'bs4'
+LXML_BACKEND = 'lxml'
+# BeautifulSoup с другими HTML-парсерами (html5lib ставится отдельно)
+HTML_PARSER_BACKEND = 'html.parser'
+HTML5LIB_BACKEND = 'html5lib'
+BACKENDS = (LXML_BACKEND, BS4_BACKEND, HTML_PARSER_BACKEND, HTML5LIB_BACKEND)
+# Способ извлечения данных со страниц для режимов
+MODE_BACKEND = {
+    'whats-new': LXML_BACKEND,
+    'pep': LXML_BACKEND,
+}
 
 PRETTY_OUTPUT = 'pretty'
 FILE_OUTPUT = 'file'
+SQLITE_OUTPUT = 'sqlite'
+JSONL_OUTPUT = 'jsonl'
+TABLE_OUTPUT = 'table'
+# Вывод -o table: наибольшая ширина столбца и пейджер, если не задан $PAGER
+TABLE_COLUMN_WIDTH = 60
+TABLE_ELLIPSIS = '…'
+PAGER = 'less -FRSX'
 
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
+LOG_LEVEL = 'INFO'
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
 DT_FORMAT = '%d.%m.%Y %H:%M:%S'
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
 
@@ -16,7 +74,62 @@ LOG_DIR = 'logs'
 PEPS_DIR = 'results'
 DOWNLOAD_DIR = 'downloads'
 LOG_FILENAME = 'parser.log'
+METRICS_DIR = 'metrics'
+TRACEMALLOC_TOP = 10
+PARSE_STORE_FILENAME = 'parse_store.sqlite'
+WAREHOUSE_FILENAME = 'results.sqlite'
+# Количество первых столбцов, составляющих ключ строки в хранилище
+# запусков, если ключ - не только первый столбец
+MODE_KEY_COLUMNS = {
+    'pep-compare': 2,
+}
+PEP_INDEX_FILENAME = 'pep_index.json'
+STORE_TIMEOUT = 30
+ALL_MODES = 'all'
+PREFETCH_MODE = 'prefetch'
+PEP_COMPARE_MODE = 'pep-compare'
+SERVE_MODE = 'serve'
+CACHE_STATS_MODE = 'cache-stats'
+CACHE_PRUNE_MODE = 'cache-prune'
+QUERY_MODE = 'query'
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8080
+# Период фонового обновления результатов сервиса, секунды
+SERVE_REFRESH = 600
 
+CACHE_NAME = 'http_cache'
+MEGABYTE = 2 ** 20
+# Наибольший размер кеша, МБ; при превышении удаляются давно
+# не использованные ответы
+CACHE_SIZE = 50
+CACHE_COMPRESSION = 6
+# Не кешируются ответы больше CACHE_MAX_RESPONSE_SIZE байт и ответы
+# с другими типами содержимого (архивы, PDF)
+CACHE_MAX_RESPONSE_SIZE = 5 * MEGABYTE
+CACHEABLE_CONTENT_TYPES = (
+    'text/', 'application/json', 'application/xml', 'application/xhtml+xml'
+)
+# Срок жизни кеша для режимов без своего срока
+DEFAULT_EXPIRE_AFTER = timedelta(hours=1)
+# Срок жизни кеша для страниц, не попавших в URLS_EXPIRE_AFTER
+MODE_EXPIRE_AFTER = {
+    'whats-new': timedelta(days=1),
+    'latest-versions': timedelta(hours=1),
+    'download': timedelta(days=1),
+    'pep': timedelta(hours=1),
+    'prefetch': timedelta(hours=1),
+}
+# Шаблоны URL без протокола, используется первый совпавший
+URLS_EXPIRE_AFTER = {
+    'peps.python.org/pep-*': timedelta(days=7),
+    'docs.python.org/*/whatsnew/*.html': timedelta(days=7),
+}
+
+PEP_TYPES = {
+    'I': 'Informational',
+    'P': 'Process',
+    'S': 'Standards Track',
+}
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
     'D': ('Deferred',),
@@ -27,3 +140,12 @@ EXPECTED_STATUS = {
     'W': ('Withdrawn',),
     '': ('Draft', 'Active'),
 }
+KNOWN_STATUSES = tuple(
+    dict.fromkeys(status for statuses in EXPECTED_STATUS.values()
+                  for status in statuses)
+)
+# Источник данных режима pep: карточки PEP или индекс PEP в JSON
+HTML_SOURCE = 'html'
+API_SOURCE = 'api'
+PEP_SOURCES = (HTML_SOURCE, API_SOURCE)
+PEP_SOURCE = HTML_SOURCE
@@ -0,0 +1,70 @@
+import hashlib
+import json
+from contextlib import closing
+
+from warehouse import connect, row_key, save_run
+
+
+DIFF_COLUMN = 'Изменение'
+ADDED = 'added'
+CHANGED = 'changed'
+REMOVED = 'removed'
+SELECT_LAST_RUN = 'SELECT MAX(id) FROM runs WHERE mode = ?'
+SELECT_RUN_DIGESTS = 'SELECT key, row FROM rows WHERE run_id = ?'
+SELECT_RUN_ROW = 'SELECT row FROM rows WHERE run_id = ? AND key = ?'
+
+
+def row_digest(row_json):
+    return hashlib.blake2b(row_json.encode('utf-8'), digest_size=16).digest()
+
+
+def dump_row(row):
+    """Строка в том же виде, в каком её сохраняет хранилище запусков."""
+    return json.dumps(row, ensure_ascii=False)
+
+
+def last_run_digests(connection, mode):
+    """Id последнего запуска режима и хеши его строк по ключам."""
+    run_id, = connection.execute(SELECT_LAST_RUN, (mode,)).fetchone()
+    if run_id is None:
+        return None, {}
+    return run_id, {
+        key: row_digest(row_json)
+        for key, row_json in connection.execute(SELECT_RUN_DIGESTS, (run_id,))
+    }
+
+
+def diff_rows(results, mode, path=None):
+    """
+    Строки, изменившиеся с последнего сохранённого запуска режима.
+    Строки сопоставляются по ключу, как в хранилище запусков,
+    и сравниваются по хешам за один проход. Текущий запуск сохраняется
+    для следующего сравнения, даже если вывод остановлен раньше конца.
+    """
+    rows = iter(results)
+    head = next(rows)
+    with closing(connect(path)) as connection:
+        run_id, previous = last_run_digests(connection, mode)
+        current = [head]
+        try:
+            yield (DIFF_COLUMN, *head)
+            for row in rows:
+                current.append(row)
+                digest = previous.pop(row_key(mode, row), None)
+                if digest is None:
+                    yield (ADDED, *row)
+                elif digest != row_digest(dump_row(row)):
+                    yield (CHANGED, *row)
+            # Удалённых строк обычно мало, они читаются по ключу
+            for key in previous:
+                row_json, = connection.execute(
+                    SELECT_RUN_ROW, (run_id, key)
+                ).fetchone()
+                yield (REMOVED, *json.loads(row_json))
+        except GeneratorExit:
+            # Вывод остановлен (--limit, закрытый пейджер): строки
+            # дочитываются, чтобы запуск сохранился целиком
+            current.extend(rows)
+            save_run(mode, current, path)
+            raise
+    save_run(mode, current, path)
@@ -2,3 +2,21 @@ class ParserFindTagException(Exception):
     """Вызывается, когда парсер не может найти тег."""
 
     pass
+
+
+class ArchiveIntegrityException(Exception):
+    """Вызывается, когда загруженный архив повреждён."""
+
+    pass
+
+
+class PepIndexNotFoundException(Exception):
+    """Вызывается, когда индекс PEP ещё не сохранён."""
+
+    pass
+
+
+class PepApiException(Exception):
+    """Вызывается, когда индекс PEP в JSON не удаётся разобрать."""
+
+    pass
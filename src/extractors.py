@@ -0,0 +1,157 @@
+from functools import partial
+from io import BytesIO
+
+import lxml.html
+from lxml import etree
+
+from constants import (BS4_BACKEND, HTML5LIB_BACKEND, HTML_PARSER_BACKEND,
+                       LXML_BACKEND)
+from exceptions import ParserFindTagException
+from metrics import timed
+from utils import FIND_TAG_ERROR_MESSAGE, find_tag, make_soup
+
+
+FIRST_H1 = etree.XPath('(//h1)[1]')
+FIRST_DL = etree.XPath('(//dl)[1]')
+PEP_STATUS = etree.XPath(
+    "(//dl)[1]//text()[. = 'Status'][1]/parent::*/following-sibling::*[1]"
+)
+HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+
+@timed
+def version_info_bs4(response, features='lxml'):
+    """Заголовок и авторы статьи о нововведениях."""
+    soup = make_soup(response, features)
+    return (
+        find_tag(soup, 'h1').text,
+        find_tag(soup, 'dl').text.replace('\n', ' ')
+    )
+
+
+@timed
+def pep_status_bs4(response, features='lxml'):
+    """Статус из карточки PEP."""
+    dl = find_tag(make_soup(response, features), 'dl')
+    return (dl.find(string='Status').parent.find_next_sibling().text,)
+
+
+def _xpath_text(tree, xpath, tag):
+    found = xpath(tree)
+    if not found:
+        raise ParserFindTagException(
+            FIND_TAG_ERROR_MESSAGE.format(tag=tag, attrs=None)
+        )
+    return found[0].text_content()
+
+
+def _parse(response):
+    return lxml.html.document_fromstring(response.content, HTML_PARSER)
+
+
+@timed
+def version_info_lxml(response):
+    """То же, что version_info_bs4, без построения дерева BeautifulSoup."""
+    tree = _parse(response)
+    return (
+        _xpath_text(tree, FIRST_H1, 'h1'),
+        _xpath_text(tree, FIRST_DL, 'dl').replace('\n', ' ')
+    )
+
+
+@timed
+def pep_status_lxml(response):
+    """То же, что pep_status_bs4, без построения дерева BeautifulSoup."""
+    return (_xpath_text(_parse(response), PEP_STATUS, 'dl'),)
+
+
+@timed
+def read_head(chunks, tags, encoding='utf-8'):
+    """
+    Начало HTML-документа до конца первых элементов tags.
+    Фрагменты передаются инкрементальному парсеру, чтение прекращается,
+    как только все элементы закрыты. Возвращает прочитанные байты
+    и признак того, что чтение остановлено после закрытия элементов.
+    """
+    parser = etree.HTMLPullParser(
+        events=('start', 'end'), tag=tags, encoding=encoding
+    )
+    first = {}
+    remaining = set(tags)
+    head = []
+    for chunk in chunks:
+        head.append(chunk)
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == 'start':
+                first.setdefault(element.tag, element)
+            elif first.get(element.tag) is element:
+                remaining.discard(element.tag)
+        if not remaining:
+            return b''.join(head), True
+    return b''.join(head), False
+
+
+def _text(element):
+    return ''.join(element.itertext())
+
+
+def _release(element):
+    """Освобождение разобранного элемента и уже пройденных соседей."""
+    element.clear()
+    while element.getprevious() is not None:
+        del element.getparent()[0]
+
+
+@timed
+def iter_pep_index(response, section_id='numerical-index'):
+    """
+    Строки таблицы section_id главной страницы PEP без построения
+    дерева страницы: (аббревиатура, номер, ссылка, название, авторы).
+    Каждая строка освобождается сразу после разбора.
+    """
+    depth = 0
+    for event, element in etree.iterparse(
+        BytesIO(response.content), events=('start', 'end'),
+        tag=('section', 'tr'), html=True, encoding=response.encoding
+    ):
+        if element.tag == 'section':
+            if event == 'start' and (depth or element.get('id') == section_id):
+                depth += 1
+            elif event == 'end' and depth:
+                depth -= 1
+                if not depth:
+                    # Нужная таблица прочитана, остаток страницы не разбираем
+                    return
+            continue
+        if event == 'start':
+            continue
+        cells = element.findall('td')
+        if depth and len(cells) >= 4:
+            link = cells[1].find('.//a')
+            yield (
+                _text(cells[0]),
+                _text(cells[1]),
+                link.get('href') if link is not None else '',
+                _text(cells[2]),
+                _text(cells[3]),
+            )
+        _release(element)
+
+
+VERSION_INFO_EXTRACTORS = {
+    BS4_BACKEND: version_info_bs4,
+    HTML_PARSER_BACKEND: partial(version_info_bs4, features='html.parser'),
+    HTML5LIB_BACKEND: partial(version_info_bs4, features='html5lib'),
+    LXML_BACKEND: version_info_lxml,
+}
+PEP_STATUS_EXTRACTORS = {
+    BS4_BACKEND: pep_status_bs4,
+    HTML_PARSER_BACKEND: partial(pep_status_bs4, features='html.parser'),
+    HTML5LIB_BACKEND: partial(pep_status_bs4, features='html5lib'),
+    LXML_BACKEND: pep_status_lxml,
+}
+MODE_TO_EXTRACTORS = {
+    'whats-new': VERSION_INFO_EXTRACTORS,
+    'pep': PEP_STATUS_EXTRACTORS,
+}
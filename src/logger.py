@@ -0,0 +1,29 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись лога одной строкой JSON."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Передаёт записи слушателю как есть: очередь не покидает процесс,
+    поэтому сообщение форматируется уже в потоке слушателя.
+    """
+
+    def prepare(self, record):
+        return record
@@ -1,76 +1,137 @@
 import logging
 import os
 import re
+from argparse import Namespace
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 
-import requests_cache
-from tqdm import tqdm
-
-from configs import configure_argument_parser, configure_logging
-from constants import (BASE_DIR, DOWNLOAD_DIR, EXPECTED_STATUS, MAIN_DOC_URL,
-                       MAIN_PEP_URL)
-from exceptions import ParserFindTagException
+from configs import (configure_argument_parser, configure_logging,
+                     configure_session)
+from constants import (ALL_MODES, API_SOURCE, BASE_DIR, CACHE_PRUNE_MODE,
+                       CACHE_STATS_MODE, CONCURRENCY, DOWNLOAD_DIR,
+                       EXPECTED_STATUS, KNOWN_STATUSES, LOW_MEMORY_WINDOW,
+                       MAIN_DOC_URL, MAIN_PEP_URL, MODE_BACKEND,
+                       MODE_STREAM_TAGS, PEP_API_URL, PEP_COMPARE_MODE,
+                       PEP_SOURCE, PEP_TYPES, PREFETCH_MODE, QUERY_MODE,
+                       SERVE_MODE, SQLITE_OUTPUT, WORKERS)
+from exceptions import ParserFindTagException, PepApiException
+from metrics import METRICS, profiling, timed, write_metrics
 from outputs import control_output
-from utils import create_soup, find_tag
+from parsing import extract_records
+from peps import (COMPARE_HEAD, PepIndex, PepRecord, compare_records,
+                  count_by, read_api_records)
+from store import open_store
+from utils import (REVALIDATE_HEADERS, create_soup, download_file, find_tag,
+                   get_response, iter_responses)
 
 
 LATEST_VERSIONS_MESSAGE = 'Ничего не нашлось'
 PARSER_START_MESSAGE = 'Парсер запущен!'
-PARSER_ARGS_MESSAGE = 'Аргументы командной строки: {args}'
+PARSER_ARGS_MESSAGE = 'Аргументы командной строки: %s'
 PARSER_STOP_MESSAGE = 'Парсер завершил работу.'
-ERROR_MESSAGE = 'Ошибка: {error}'
-DOWNLOAD_MESSAGE = 'Архив был загружен и сохранён: {archive_path}'
-RESPONSE_IS_NONE = 'Страница {url} не загружена, ошибка {error}'
+ERROR_MESSAGE = 'Ошибка: %s'
+STANDALONE_MODE_MESSAGE = 'Режим {mode} запускается без других режимов'
+DIFF_SQLITE_MESSAGE = (
+    'С --diff запуск и так сохраняется в базу, -o sqlite не нужен'
+)
+PEP_INDEX_MESSAGE = 'Индекс PEP сохранён: %s'
+TRANSPORT_STATS_MESSAGE = 'Статистика соединений: %s'
+METRICS_MESSAGE = 'Метрики запуска сохранены: %s'
+PEP_API_FALLBACK_MESSAGE = (
+    'Индекс PEP в JSON недоступен, статусы читаются из карточек PEP: %s'
+)
+PREFETCH_MESSAGE = 'Загружено в кеш страниц: %s, с ошибкой: %s'
+PREFETCH_ERROR_MESSAGE = 'Страница не загружена в кеш: %s'
+PEAK_RSS_MESSAGE = 'Пиковое потребление памяти: %s КБ'
+DOWNLOAD_MESSAGE = 'Архив был загружен и сохранён: %s'
+DOWNLOAD_SKIP_MESSAGE = 'Архив уже загружен: %s'
+RESPONSE_IS_NONE = 'Страница %s не загружена, ошибка %s'
 MISMATCHED_STATUS_MESSAGE = (
     'Несовпадающие статусы:\n'
-    '{pep_url}\n'
-    'Статус в карточке: {status}\n'
-    'Ожидаемые статусы: {preview_status}'
+    '%s\n'
+    'Статус в карточке: %s\n'
+    'Ожидаемые статусы: %s'
 )
+PEP_MESSAGE = '%s, %s, %s, %s, %s'
 PEPS_HEAD = ('Статус', 'Количество')
 PEPS_TAIL = 'Всего'
 WHATS_NEW_HEAD = ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
 LATEST_VERSIONS_HEAD = ('Ссылка на документацию', 'Версия', 'Статус')
+QUERY_HEAD = ('Номер', 'Название', 'Авторы', 'Тип', 'Статус', 'Ссылка')
+QUERY_GROUP_HEAD = {
+    'status': ('Статус', 'Количество'),
+    'type': ('Тип', 'Количество'),
+    'author': ('Автор', 'Количество'),
+}
 
 
-def whats_new(session):
+def get_extractor(cli_args, mode):
     """
-    Запуск парсера информации из статей о нововведениях в Python.
-    https://docs.python.org/3/whatsnew/
+    Функция извлечения данных со страницы для режима.
+    Способ извлечения - из командной строки или по режиму.
     """
+    from extractors import MODE_TO_EXTRACTORS
+
+    backend = getattr(cli_args, 'backend', None)
+    if backend is None:
+        backend = MODE_BACKEND[mode]
+    return MODE_TO_EXTRACTORS[mode][backend]
+
+
+def get_head_tags(cli_args, mode):
+    """Теги, до которых читаются страницы режима с --stream."""
+    if getattr(cli_args, 'stream', False):
+        return MODE_STREAM_TAGS[mode]
+    return None
+
+
+def read_whats_new_links(session):
+    """Ссылки на статьи о нововведениях со страницы whatsnew."""
     whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    results = []
-    logs = []
-    for anchor in tqdm(
-        create_soup(
-            session, whats_new_url
-        ).select(
+    return [
+        urljoin(whats_new_url, anchor['href'])
+        for anchor in create_soup(session, whats_new_url).select(
             '#what-s-new-in-python div.toctree-wrapper '
             'li.toctree-l1 a[href$=".html"]'
         )
-    ):
-        version_link = urljoin(whats_new_url, anchor['href'])
-        try:
-            soup = create_soup(session, version_link)
-            results.append(
-                (
-                    version_link,
-                    find_tag(soup, 'h1').text,
-                    find_tag(soup, 'dl').text.replace('\n', ' ')
-                )
-            )
-        except ConnectionError as error:
-            logs.append(RESPONSE_IS_NONE.format(url=version_link, error=error))
-    list(map(logging.info, logs))
-    return [WHATS_NEW_HEAD, *results]
+    ]
 
 
-def latest_versions(session):
+@timed
+def whats_new_rows(session, cli_args=None):
+    """Строки результата whats_new по мере загрузки статей."""
+    yield WHATS_NEW_HEAD
+    version_links = read_whats_new_links(session)
+    responses = iter_responses(
+        session, version_links,
+        getattr(cli_args, 'concurrency', CONCURRENCY),
+        head_tags=get_head_tags(cli_args, 'whats-new')
+    )
+    extractor = get_extractor(cli_args, 'whats-new')
+    with open_store(cli_args) as store:
+        for version_link, record in zip(version_links, extract_records(
+            store, 'whats-new', zip(version_links, responses), extractor,
+            getattr(cli_args, 'workers', WORKERS)
+        )):
+            if isinstance(record, ConnectionError):
+                logging.info(RESPONSE_IS_NONE, version_link, record)
+                continue
+            yield (version_link, *record)
+
+
+@timed
+def whats_new(session, cli_args=None):
     """
-    Запуск парсера статусов версий Python.
-    https://docs.python.org/3/
+    Запуск парсера информации из статей о нововведениях в Python.
+    https://docs.python.org/3/whatsnew/
     """
+    return list(whats_new_rows(session, cli_args))
+
+
+@timed
+def latest_versions_rows(session, cli_args=None):
+    """Строки результата latest_versions."""
     for ul in create_soup(session, MAIN_DOC_URL).select(
         'div.sphinxsidebarwrapper ul'
     ):
@@ -79,7 +140,7 @@ def latest_versions(session):
             break
         else:
             raise ParserFindTagException(LATEST_VERSIONS_MESSAGE)
-    results = []
+    yield LATEST_VERSIONS_HEAD
     pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
     for a_tag in a_tags:
         text_match = re.search(pattern, a_tag.text)
@@ -87,11 +148,20 @@ def latest_versions(session):
             version, status = text_match.groups()
         else:
             version, status = a_tag.text, ''
-        results.append((a_tag['href'], version, status))
-    return [LATEST_VERSIONS_HEAD, *results]
+        yield (a_tag['href'], version, status)
+
+
+@timed
+def latest_versions(session, cli_args=None):
+    """
+    Запуск парсера статусов версий Python.
+    https://docs.python.org/3/
+    """
+    return list(latest_versions_rows(session, cli_args))
 
 
-def download(session):
+@timed
+def download(session, cli_args=None):
     """
     Запуск парсера, который скачивает архив документации Python.
     https://docs.python.org/3/download.html
@@ -107,55 +177,204 @@ def download(session):
     downloads_dir = BASE_DIR / DOWNLOAD_DIR
     downloads_dir.mkdir(exist_ok=True)
     archive_path = downloads_dir / filename
-    response = session.get(archive_url)
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
-    logging.info(DOWNLOAD_MESSAGE.format(archive_path=archive_path))
+    # Для снимка архив загружается целиком, иначе его не будет в снимке
+    if download_file(
+        session, archive_url, archive_path,
+        full=getattr(cli_args, 'record', None) is not None
+    ):
+        logging.info(DOWNLOAD_MESSAGE, archive_path)
+    else:
+        logging.info(DOWNLOAD_SKIP_MESSAGE, archive_path)
 
 
-def pep(session):
+def iter_pep_index_rows(session, low_memory=False):
     """
-    Запуск парсера и получение статистики по PEP.
-    https://peps.python.org/
+    Строки таблицы numerical-index главной страницы PEP:
+    (аббревиатура, номер, ссылка, название, авторы).
+    С low_memory таблица читается потоково, без дерева всей страницы.
     """
+    if low_memory:
+        from extractors import iter_pep_index
+
+        yield from iter_pep_index(get_response(session, MAIN_PEP_URL))
+        return
     soup = create_soup(session, MAIN_PEP_URL)
     numerical_index_section = find_tag(
         soup, 'section', attrs={'id': 'numerical-index'}
     )
     tbody = numerical_index_section.find('tbody')
-    peps = tbody.find_all('tr')
-    peps_result = defaultdict(int)
-    logs = []
-    for row_pep in tqdm(peps):
+    for row_pep in tbody.find_all('tr'):
         pep = row_pep.find_all('td')
-        preview_status = EXPECTED_STATUS.get(pep[0].text[1:2])
-        number = pep[1].text
-        href = pep[1].find('a')['href']
-        title = pep[2].text
-        authors = pep[3].text
-        pep_url = urljoin(MAIN_PEP_URL, href)
-        try:
-            soup = create_soup(session, pep_url)
-            dl = find_tag(soup, 'dl')
-            status = dl.find(string='Status').parent.find_next_sibling().text
-            if preview_status is None or status not in preview_status:
-                logs.append(
-                    MISMATCHED_STATUS_MESSAGE.format(
-                        pep_url=pep_url, status=status,
-                        preview_status=preview_status)
-                )
-            peps_result[status] += 1
-            logs.append(
-                f'{number}, {preview_status}, {title}, {authors}, {pep_url}')
-        except ConnectionError as error:
-            # Если не загрузится, программа перейдёт к следующей ссылке
-            logs.append(RESPONSE_IS_NONE.format(url=pep_url, error=error))
-    list(map(logging.info, logs))
+        yield (
+            pep[0].text, pep[1].text, pep[1].find('a')['href'],
+            pep[2].text, pep[3].text
+        )
+
+
+def read_pep_index(session, low_memory=False):
+    """
+    Ожидаемые статусы и записи PEP из таблицы numerical-index
+    главной страницы PEP; статус из карточки заполняется позже.
+    """
     return [
-        PEPS_HEAD,
-        *peps_result.items(),
-        (PEPS_TAIL, sum(peps_result.values()))
+        (
+            EXPECTED_STATUS.get(abbr[1:2]),
+            PepRecord(
+                number=int(number),
+                title=title,
+                authors=authors.split(', '),
+                type=PEP_TYPES.get(abbr[:1], abbr[:1]),
+                status=None,
+                url=urljoin(MAIN_PEP_URL, href)
+            )
+        )
+        for abbr, number, href, title, authors in iter_pep_index_rows(
+            session, low_memory
+        )
+    ]
+
+
+def iter_html_peps(session, cli_args=None):
+    """
+    Ожидаемые статусы и записи PEP со статусами из карточек PEP.
+    PEP, карточки которых не загрузились, пропускаются.
+    """
+    low_memory = getattr(cli_args, 'low_memory', False)
+    peps = read_pep_index(session, low_memory)
+    pep_urls = [record.url for _, record in peps]
+    concurrency = getattr(cli_args, 'concurrency', CONCURRENCY)
+    responses = iter_responses(
+        session, pep_urls, concurrency,
+        # Загруженных, но ещё не разобранных страниц не больше окна
+        window=concurrency * LOW_MEMORY_WINDOW if low_memory else None,
+        head_tags=get_head_tags(cli_args, 'pep')
+    )
+    extractor = get_extractor(cli_args, 'pep')
+    with open_store(cli_args) as store:
+        for (preview_status, pep), record in zip(
+            peps, extract_records(
+                store, 'pep', zip(pep_urls, responses), extractor,
+                getattr(cli_args, 'workers', WORKERS)
+            )
+        ):
+            if isinstance(record, ConnectionError):
+                # Если не загрузится, программа перейдёт к следующей ссылке
+                logging.info(RESPONSE_IS_NONE, pep.url, record)
+                continue
+            pep.status, = record
+            yield preview_status, pep
+
+
+def read_api_peps(session):
+    """Записи PEP из индекса в JSON: один запрос вместо карточек PEP."""
+    return read_api_records(get_response(session, PEP_API_URL).text)
+
+
+def iter_peps(session, cli_args=None):
+    """
+    Ожидаемые статусы и записи PEP из источника --source.
+    Если индекс в JSON недоступен, PEP читаются из карточек.
+    """
+    if getattr(cli_args, 'source', PEP_SOURCE) == API_SOURCE:
+        try:
+            records = read_api_peps(session)
+        except (ConnectionError, PepApiException) as error:
+            logging.warning(PEP_API_FALLBACK_MESSAGE, error)
+        else:
+            # Статус в JSON - тот же, что в карточке; проверяется,
+            # что он из известных
+            for record in records:
+                yield KNOWN_STATUSES, record
+            return
+    yield from iter_html_peps(session, cli_args)
+
+
+@timed
+def pep_rows(session, cli_args=None):
+    """
+    Строки результата pep: заголовок сразу, статистика статусов
+    и итог - после обхода всех PEP.
+    """
+    yield PEPS_HEAD
+    peps_result = defaultdict(int)
+    pep_index = PepIndex()
+    for preview_status, pep in iter_peps(session, cli_args):
+        if preview_status is None or pep.status not in preview_status:
+            logging.warning(
+                MISMATCHED_STATUS_MESSAGE, pep.url, pep.status, preview_status
+            )
+        peps_result[pep.status] += 1
+        pep_index.add(pep)
+        # Строка на каждый PEP: форматируется, только если включён DEBUG
+        logging.debug(
+            PEP_MESSAGE,
+            pep.number, preview_status, pep.title, pep.authors, pep.url
+        )
+    if getattr(cli_args, 'pep_index', False):
+        logging.info(PEP_INDEX_MESSAGE, pep_index.save())
+    yield from peps_result.items()
+    yield (PEPS_TAIL, sum(peps_result.values()))
+
+
+@timed
+def pep(session, cli_args=None):
+    """
+    Запуск парсера и получение статистики по PEP.
+    https://peps.python.org/
+    """
+    return list(pep_rows(session, cli_args))
+
+
+@timed
+def pep_compare_rows(session, cli_args=None):
+    """
+    Расхождения записей PEP из карточек и из индекса в JSON;
+    в итоге - количество расхождений.
+    """
+    api_records = read_api_peps(session)
+    html_records = [pep for _, pep in iter_html_peps(session, cli_args)]
+    yield COMPARE_HEAD
+    total = 0
+    for row in compare_records(html_records, api_records):
+        total += 1
+        yield row
+    yield (PEPS_TAIL, total, '', '')
+
+
+@timed
+def prefetch(session, cli_args=None):
+    """
+    Загрузка в HTTP-кеш всех страниц режимов pep, whats-new
+    и latest-versions: сначала индексные страницы, затем страницы
+    по ссылкам из них. Записи, которые уже есть в кеше, перепроверяются
+    условными запросами.
+    """
+    concurrency = getattr(cli_args, 'concurrency', CONCURRENCY)
+    index_urls = [
+        MAIN_DOC_URL, urljoin(MAIN_DOC_URL, 'whatsnew/'), MAIN_PEP_URL
     ]
+    errors = [
+        response for response in iter_responses(
+            session, index_urls, concurrency, headers=REVALIDATE_HEADERS
+        )
+        if isinstance(response, ConnectionError)
+    ]
+    if errors:
+        raise errors[0]
+    # Индексные страницы уже в кеше, ссылки читаются без сети
+    links = [
+        PEP_API_URL,
+        *read_whats_new_links(session),
+        *(pep.url for _, pep in read_pep_index(session, low_memory=True))
+    ]
+    failed = 0
+    for response in iter_responses(
+        session, links, concurrency, headers=REVALIDATE_HEADERS
+    ):
+        if isinstance(response, ConnectionError):
+            logging.info(PREFETCH_ERROR_MESSAGE, response)
+            failed += 1
+    logging.info(PREFETCH_MESSAGE, len(index_urls) + len(links), failed)
 
 
 MODE_TO_FUNCTION = {
@@ -164,27 +383,174 @@ MODE_TO_FUNCTION = {
     'download': download,
     'pep': pep
 }
+# Режимы, строки которых передаются в вывод по мере получения
+MODE_TO_ROWS = {
+    'whats-new': whats_new_rows,
+    'latest-versions': latest_versions_rows,
+    'pep': pep_rows,
+    PEP_COMPARE_MODE: pep_compare_rows,
+}
+# Режимы, результаты которых отдаёт сервис
+SERVED_MODES = {
+    'whats-new': whats_new,
+    'latest-versions': latest_versions,
+    'pep': pep,
+}
+
+
+def query_rows(cli_args):
+    """
+    Строки записей PEP из индекса последнего запуска pep, без загрузки
+    страниц; с --group-by - количество записей по значениям поля.
+    """
+    records = PepIndex.load().query(
+        number=cli_args.number,
+        status=cli_args.status,
+        type=cli_args.type,
+        author=cli_args.author
+    )
+    if cli_args.group_by is None:
+        yield QUERY_HEAD
+        for record in records:
+            yield record.as_row()
+        return
+    yield QUERY_GROUP_HEAD[cli_args.group_by]
+    yield from count_by(records, cli_args.group_by).most_common()
+    yield (PEPS_TAIL, len(records))
+
+
+def cache_stats(cli_args):
+    """Записи, объём и доля попаданий HTTP-кеша по хостам."""
+    from cache import cache_stats_rows
+
+    return cache_stats_rows(cli_args)
+
+
+def cache_prune(cli_args):
+    """Удаление давно не использованных ответов из HTTP-кеша."""
+    from cache import cache_prune_rows
+
+    return cache_prune_rows(cli_args)
+
+
+# Режимы без загрузки страниц, запускаются без других режимов
+OFFLINE_MODES = {
+    QUERY_MODE: query_rows,
+    CACHE_STATS_MODE: cache_stats,
+    CACHE_PRUNE_MODE: cache_prune,
+}
+
+
+def expand_modes(modes):
+    """
+    Режимы запуска в порядке указания, без повторов; all - все режимы.
+    prefetch выполняется первым.
+    """
+    if ALL_MODES in modes:
+        expanded = list(MODE_TO_FUNCTION)
+    else:
+        expanded = [
+            mode for mode in dict.fromkeys(modes) if mode != PREFETCH_MODE
+        ]
+    if PREFETCH_MODE in modes:
+        expanded.insert(0, PREFETCH_MODE)
+    return expanded
+
+
+def run_modes(session, cli_args):
+    """
+    Один режим выводит строки по мере получения.
+    Несколько режимов выполняются параллельно в общей сессии,
+    результаты выводятся в порядке режимов.
+    prefetch заполняет кеш до запуска остальных режимов.
+    """
+    modes_args = [
+        Namespace(**{**vars(cli_args), 'mode': mode})
+        for mode in cli_args.mode
+    ]
+    if modes_args[0].mode == PREFETCH_MODE:
+        prefetch(session, modes_args.pop(0))
+    if not modes_args:
+        return
+    if len(modes_args) == 1:
+        mode_args, = modes_args
+        if mode_args.mode in MODE_TO_ROWS:
+            control_output(
+                MODE_TO_ROWS[mode_args.mode](session, mode_args), mode_args
+            )
+        else:
+            MODE_TO_FUNCTION[mode_args.mode](session, mode_args)
+        return
+    with ThreadPoolExecutor(max_workers=len(modes_args)) as executor:
+        futures = [
+            executor.submit(
+                MODE_TO_FUNCTION[mode_args.mode], session, mode_args
+            )
+            for mode_args in modes_args
+        ]
+        for mode_args, future in zip(modes_args, futures):
+            # Ошибка одного режима не отменяет вывод остальных
+            try:
+                results = future.result()
+            except Exception as error:
+                logging.exception(ERROR_MESSAGE, error)
+                continue
+            if results is not None:
+                control_output(results, mode_args)
+
+
+def run_session(args):
+    """Запуск режимов в общей сессии с метриками запуска."""
+    with configure_session(args) as session, profiling(args):
+        if args.mode == [SERVE_MODE]:
+            from service import serve
+
+            serve(session, args, SERVED_MODES)
+        else:
+            run_modes(session, args)
+    transport_stats = session.get_adapter(MAIN_DOC_URL).stats.as_dict()
+    logging.info(TRANSPORT_STATS_MESSAGE, transport_stats)
+    logging.info(
+        METRICS_MESSAGE, write_metrics(args, transport=transport_stats)
+    )
+    logging.info(PEAK_RSS_MESSAGE, METRICS.extra['peak_rss_kb'])
 
 
 def main():
     """Точка входа парсера."""
-    configure_logging()
-    logging.info(PARSER_START_MESSAGE)
-    arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
-    # Считывание аргументов из командной строки
+    arg_parser = configure_argument_parser(
+        [
+            *MODE_TO_FUNCTION, ALL_MODES, PREFETCH_MODE, PEP_COMPARE_MODE,
+            SERVE_MODE, *OFFLINE_MODES
+        ]
+    )
+    # Считывание аргументов из командной строки: -h и ошибки в аргументах
+    # не создают логов и не загружают сетевые библиотеки
+    args = arg_parser.parse_args()
+    for mode in (SERVE_MODE, PEP_COMPARE_MODE, *OFFLINE_MODES):
+        if mode in args.mode and len(args.mode) > 1:
+            arg_parser.error(STANDALONE_MODE_MESSAGE.format(mode=mode))
+    if args.diff and args.output == SQLITE_OUTPUT:
+        arg_parser.error(DIFF_SQLITE_MESSAGE)
+    log_listener = configure_logging(args)
     try:
-        args = arg_parser.parse_args()
-        logging.info(PARSER_ARGS_MESSAGE.format(args=args))
-        session = requests_cache.CachedSession()
-        if args.clear_cache:
-            session.cache.clear()
-        parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
-        if results is not None:
-            control_output(results, args)
-    except Exception as error:
-        logging.exception(ERROR_MESSAGE.format(error=error))
-    logging.info(PARSER_STOP_MESSAGE)
+        logging.info(PARSER_START_MESSAGE)
+        # Запись форматируется в потоке логирования: копия не изменится
+        # вместе с args.mode
+        logging.info(PARSER_ARGS_MESSAGE, vars(args).copy())
+        try:
+            if args.mode[0] in OFFLINE_MODES:
+                args.mode, = args.mode
+                control_output(OFFLINE_MODES[args.mode](args), args)
+            else:
+                args.mode = expand_modes(args.mode)
+                run_session(args)
+        except Exception as error:
+            logging.exception(ERROR_MESSAGE, error)
+        logging.info(PARSER_STOP_MESSAGE)
+    finally:
+        # Дописывает оставшиеся в очереди записи
+        log_listener.stop()
 
 
 if __name__ == '__main__':
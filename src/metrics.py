@@ -0,0 +1,173 @@
+import datetime as dt
+import inspect
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+
+from constants import BASE_DIR, DATETIME_FORMAT, METRICS_DIR, TRACEMALLOC_TOP
+
+CACHE_HIT = 'hit'
+CACHE_MISS = 'miss'
+CACHE_STALE = 'stale'
+
+
+class Metrics:
+    """
+    Длительности этапов работы парсера и счётчики.
+    Время этапов включающее: время режима содержит время загрузки страниц.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.phases = defaultdict(lambda: [0, 0.0])
+        self.counters = Counter()
+        self.extra = {}
+
+    def add(self, phase, seconds):
+        with self._lock:
+            self.phases[phase][0] += 1
+            self.phases[phase][1] += seconds
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def record_response(self, response, seconds):
+        """Учёт ответа: объём, попадание в кеш и время загрузки."""
+        status = cache_status(response)
+        self.add(f'get_response:{status}', seconds)
+        self.count(f'cache_{status}')
+        if status == CACHE_MISS:
+            # Ответы из кеша не загружались из сети
+            self.count('bytes_fetched', len(response.content))
+
+    def summary(self):
+        return {
+            'phases': {
+                phase: {'calls': calls, 'seconds': round(seconds, 6)}
+                for phase, (calls, seconds) in sorted(self.phases.items())
+            },
+            'counters': dict(self.counters),
+            **self.extra,
+        }
+
+
+METRICS = Metrics()
+
+
+def cache_status(response):
+    """Ответ из кеша, устаревший ответ из кеша или загруженный из сети."""
+    if not getattr(response, 'from_cache', False):
+        return CACHE_MISS
+    if getattr(response, 'is_expired', False):
+        return CACHE_STALE
+    return CACHE_HIT
+
+
+def _timed_generator(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        seconds = 0.0
+        generator = func(*args, **kwargs)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(generator)
+                finally:
+                    seconds += time.perf_counter() - start
+                yield item
+        except StopIteration:
+            return
+        finally:
+            generator.close()
+            METRICS.add(func.__name__, seconds)
+    return wrapper
+
+
+def timed(func):
+    """
+    Учёт времени выполнения функции как отдельного этапа.
+    Для генераторов учитывается время получения всех элементов.
+    """
+    if inspect.isgeneratorfunction(func):
+        return _timed_generator(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            METRICS.add(func.__name__, time.perf_counter() - start)
+    return wrapper
+
+
+def metrics_path(cli_args, suffix):
+    metrics_dir = BASE_DIR / METRICS_DIR
+    metrics_dir.mkdir(exist_ok=True)
+    now_formatted = dt.datetime.now().strftime(DATETIME_FORMAT)
+    mode = cli_args.mode
+    if not isinstance(mode, str):
+        mode = '+'.join(mode)
+    return metrics_dir / f'{mode}_{now_formatted}{suffix}'
+
+
+@contextmanager
+def profiling(cli_args):
+    """Снятие профиля cProfile и tracemalloc при запуске с --profile."""
+    if not getattr(cli_args, 'profile', False):
+        yield
+        return
+    import cProfile
+    import tracemalloc
+
+    profile = cProfile.Profile()
+    tracemalloc.start()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        profile_path = metrics_path(cli_args, '.prof')
+        profile.dump_stats(profile_path)
+        METRICS.extra['profile'] = str(profile_path)
+        METRICS.extra['tracemalloc'] = {
+            'current_bytes': current,
+            'peak_bytes': peak,
+            'top': [
+                str(stat) for stat in
+                snapshot.statistics('lineno')[:TRACEMALLOC_TOP]
+            ],
+        }
+
+
+def peak_rss_kb():
+    """Пиковый размер резидентной памяти процесса, КБ (None вне Unix)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # В macOS ru_maxrss в байтах, в Linux - в килобайтах
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def write_metrics(cli_args, **extra):
+    """Сохранение сводки метрик запуска в JSON."""
+    METRICS.extra.update(extra)
+    METRICS.extra['peak_rss_kb'] = peak_rss_kb()
+    file_path = metrics_path(cli_args, '.json')
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(METRICS.summary(), file, ensure_ascii=False, indent=2)
+    return file_path
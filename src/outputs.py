@@ -1,52 +1,218 @@
 import csv
 import datetime as dt
+import json
 import logging
+import os
+import sys
+from contextlib import contextmanager
+from itertools import chain, islice
 
-from prettytable import PrettyTable
+from constants import (BASE_DIR, DATETIME_FORMAT, FILE_OUTPUT, JSONL_OUTPUT,
+                       PAGER, PEPS_DIR, PRETTY_OUTPUT, SQLITE_OUTPUT,
+                       TABLE_COLUMN_WIDTH, TABLE_ELLIPSIS, TABLE_OUTPUT)
+from metrics import timed
 
-from constants import (BASE_DIR, DATETIME_FORMAT, FILE_OUTPUT, PEPS_DIR,
-                       PRETTY_OUTPUT)
+FILE_SAVE_MESSAGE = 'Файл с результатами был сохранён: %s'
+SQLITE_SAVE_MESSAGE = 'Запуск %s сохранён в базу: %s'
+PAGER_ERROR_MESSAGE = 'Пейджер %s не запущен: %s'
 
-FILE_SAVE_MESSAGE = 'Файл с результатами был сохранён: {file_path}'
 
+def limit_rows(results, cli_args=None):
+    """Заголовок и не больше --limit строк результата."""
+    rows = iter(results)
+    limit = getattr(cli_args, 'limit', None)
+    if limit is None:
+        return rows
+    return chain(islice(rows, 1), islice(rows, max(limit, 0)))
 
-def default_output(results, *args):
-    """Вывод данных в терминал построчно."""
-    for row in results:
-        print(*row)
 
+def default_output(results, cli_args=None):
+    """Вывод данных в терминал построчно по мере получения."""
+    for row in limit_rows(results, cli_args):
+        print(*row, flush=True)
 
-def pretty_output(results, *args):
+
+def pretty_output(results, cli_args=None):
     """Вывод данных в формате PrettyTable."""
+    from prettytable import PrettyTable
+
+    rows = limit_rows(results, cli_args)
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = next(rows)
     # Выравниваем всю таблицу по левому краю
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(list(rows))
     print(table)
 
 
-def file_output(results, cli_args):
-    """Создание директории с результатами парсинга."""
+def _cell(value, max_width):
+    text = ' '.join(str(value).split())
+    if len(text) > max_width:
+        return text[:max(max_width - 1, 0)] + TABLE_ELLIPSIS
+    return text
+
+
+def render_table(rows, max_width=TABLE_COLUMN_WIDTH):
+    """
+    Строки таблицы, выровненной по левому краю. Ширина столбцов
+    считается за один проход, значения длиннее max_width обрезаются.
+    """
+    cells = [[_cell(value, max_width) for value in row] for row in rows]
+    widths = []
+    for row in cells:
+        for column, text in enumerate(row):
+            if column == len(widths):
+                widths.append(len(text))
+            elif len(text) > widths[column]:
+                widths[column] = len(text)
+    lines = [
+        ' | '.join(
+            text.ljust(width) for text, width in zip(row, widths)
+        ).rstrip()
+        for row in cells
+    ]
+    lines.insert(1, '-+-'.join('-' * width for width in widths))
+    return lines
+
+
+def table_pages(rows, page_size=None):
+    """
+    Страницы таблицы по page_size строк, каждая с заголовком;
+    без page_size - одна страница.
+    """
+    rows = iter(rows)
+    head = next(rows)
+    if not page_size:
+        yield [head, *rows]
+        return
+    while True:
+        page = list(islice(rows, page_size))
+        if not page:
+            return
+        yield [head, *page]
+
+
+@contextmanager
+def open_terminal(pager=False):
+    """
+    Поток вывода таблицы: стандартный вывод или ввод пейджера.
+    Пейджер запускается, только если вывод идёт в терминал.
+    """
+    if not pager or not sys.stdout.isatty():
+        yield sys.stdout
+        return
+    import shlex
+    import subprocess
+
+    command = os.environ.get('PAGER') or PAGER
+    try:
+        process = subprocess.Popen(
+            shlex.split(command), stdin=subprocess.PIPE,
+            encoding=sys.stdout.encoding, errors='replace'
+        )
+    except OSError as error:
+        logging.warning(PAGER_ERROR_MESSAGE, command, error)
+        yield sys.stdout
+        return
+    try:
+        yield process.stdin
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        process.wait()
+
+
+def table_output(results, cli_args=None):
+    """
+    Быстрый вывод таблицы в терминал: страница собирается в одну строку
+    и пишется одной записью, при закрытии пейджера вывод прекращается.
+    """
+    pages = table_pages(
+        limit_rows(results, cli_args), getattr(cli_args, 'page_size', None)
+    )
+    max_width = getattr(cli_args, 'max_width', TABLE_COLUMN_WIDTH)
+    with open_terminal(getattr(cli_args, 'pager', False)) as stream:
+        try:
+            for number, page in enumerate(pages):
+                stream.write(
+                    ('\n' if number else '')
+                    + '\n'.join(render_table(page, max_width)) + '\n'
+                )
+                stream.flush()
+        except BrokenPipeError:
+            # Пейджер закрыт раньше конца таблицы
+            pass
+
+
+def results_file_path(cli_args, extension):
+    """Путь к файлу результатов в директории results."""
     results_dir = BASE_DIR / PEPS_DIR
     results_dir.mkdir(exist_ok=True)
     # Получаем режим работы парсера из аргументов командной строки
     parser_mode = cli_args.mode
     now_formatted = dt.datetime.now().strftime(DATETIME_FORMAT)
     # 2021-06-18_07-40-41
-    file_path = results_dir / f'{parser_mode}_{now_formatted}.csv'
+    return results_dir / f'{parser_mode}_{now_formatted}.{extension}'
+
+
+def file_output(results, cli_args):
+    """Запись результатов парсинга в csv-файл по мере получения."""
+    file_path = results_file_path(cli_args, 'csv')
+    with open(file_path, 'w', encoding='utf-8') as file:
+        writer = csv.writer(file, csv.unix_dialect)
+        # Каждая строка сразу попадает в файл
+        for row in results:
+            writer.writerow(row)
+            file.flush()
+    logging.info(FILE_SAVE_MESSAGE, file_path)
+
+
+def jsonl_output(results, cli_args):
+    """Запись результатов в JSON Lines: объект на строку, ключи - заголовок."""
+    file_path = results_file_path(cli_args, 'jsonl')
+    rows = iter(results)
+    head = next(rows)
     with open(file_path, 'w', encoding='utf-8') as file:
-        csv.writer(file, csv.unix_dialect).writerows(results)
-    logging.info(FILE_SAVE_MESSAGE.format(file_path=file_path))
+        for row in rows:
+            file.write(
+                json.dumps(dict(zip(head, row)), ensure_ascii=False) + '\n'
+            )
+            file.flush()
+    logging.info(FILE_SAVE_MESSAGE, file_path)
+
+
+def sqlite_output(results, cli_args):
+    """Сохранение результатов запуска в базу SQLite."""
+    from warehouse import save_run, warehouse_path
+
+    run_id = save_run(cli_args.mode, results)
+    logging.info(SQLITE_SAVE_MESSAGE, run_id, warehouse_path())
 
 
 OUTPUT_FORMAT = {
     PRETTY_OUTPUT: pretty_output,
+    TABLE_OUTPUT: table_output,
     FILE_OUTPUT: file_output,
+    SQLITE_OUTPUT: sqlite_output,
+    JSONL_OUTPUT: jsonl_output,
     None: default_output
 }
 
 
+@timed
 def control_output(results, cli_args):
-    """Контроль вывода результатов парсинга."""
+    """
+    Контроль вывода результатов парсинга.
+    С --diff выводятся только изменения с прошлого запуска режима.
+    """
+    if getattr(cli_args, 'diff', False):
+        from diff import diff_rows
+
+        results = diff_rows(results, cli_args.mode)
     OUTPUT_FORMAT.get(cli_args.output)(results, cli_args)
+    # Генератор, недочитанный выводом (--limit), завершается сразу,
+    # а не при сборке мусора
+    if hasattr(results, 'close'):
+        results.close()
@@ -0,0 +1,99 @@
+import time
+from collections import deque, namedtuple
+from functools import partial
+
+from constants import PARSE_WINDOW, WORKERS
+from metrics import METRICS
+from store import response_key
+
+# Процессы-обработчики запускаются не через fork: fork во время загрузки
+# страниц может скопировать блокировку, захваченную потоком загрузки
+WORKERS_START_METHOD = 'forkserver'
+
+
+class Page(namedtuple('Page', 'content encoding')):
+    """Тело ответа, передаваемое в процесс разбора вместо Response."""
+
+    __slots__ = ()
+
+    @property
+    def text(self):
+        return str(self.content, self.encoding, errors='replace')
+
+
+def _unwrap(extractor):
+    """Функция извлечения без @timed и имя её этапа."""
+    if isinstance(extractor, partial):
+        func, phase = _unwrap(extractor.func)
+        return partial(func, *extractor.args, **extractor.keywords), phase
+    return getattr(extractor, '__wrapped__', extractor), extractor.__name__
+
+
+def extract_page(extractor, content, encoding):
+    """
+    Разбор страницы в процессе-обработчике.
+    Замеры процесса-обработчика не попадают в METRICS основного
+    процесса, поэтому время разбора возвращается вместе с результатом.
+    """
+    func, phase = _unwrap(extractor)
+    start = time.perf_counter()
+    record = tuple(func(Page(content, encoding)))
+    return record, phase, time.perf_counter() - start
+
+
+def _lookup(store, kind, url, response, executor, extractor):
+    if isinstance(response, ConnectionError):
+        return url, None, response
+    key = response_key(response)
+    record = store.get(kind, url, key)
+    if record is not None:
+        return url, key, record
+    if executor is None:
+        return url, key, tuple(extractor(response))
+    return url, key, executor.submit(
+        extract_page, extractor, response.content, response.encoding
+    )
+
+
+def _finish(store, kind, url, key, record):
+    if isinstance(record, ConnectionError):
+        return record
+    if not isinstance(record, tuple):
+        record, phase, seconds = record.result()
+        METRICS.add(phase, seconds)
+    store.set(kind, url, key, record)
+    return record
+
+
+def _extract_records(store, kind, pages, extractor, executor, window):
+    pending = deque()
+    for url, response in pages:
+        pending.append(
+            _lookup(store, kind, url, response, executor, extractor)
+        )
+        if len(pending) >= window:
+            yield _finish(store, kind, *pending.popleft())
+    while pending:
+        yield _finish(store, kind, *pending.popleft())
+
+
+def extract_records(store, kind, pages, extractor, workers=WORKERS):
+    """
+    Результаты разбора страниц в порядке pages.
+    pages - пары (URL, ответ или ConnectionError), ошибки отдаются как есть.
+    Страницы, которых нет в хранилище, при workers > 0 разбираются
+    в пуле процессов, туда передаётся только тело ответа.
+    """
+    if workers <= 0:
+        yield from _extract_records(store, kind, pages, extractor, None, 1)
+        return
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(WORKERS_START_METHOD)
+    ) as executor:
+        yield from _extract_records(
+            store, kind, pages, extractor, executor, workers * PARSE_WINDOW
+        )
@@ -0,0 +1,174 @@
+import json
+import os
+from collections import Counter, defaultdict
+
+from constants import BASE_DIR, PEP_INDEX_FILENAME
+from exceptions import PepApiException, PepIndexNotFoundException
+
+
+PEP_INDEX_NOT_FOUND_MESSAGE = (
+    'Индекс PEP {path} не найден, сначала запустите режим pep'
+)
+PEP_FIELDS = ('number', 'title', 'authors', 'type', 'status', 'url')
+# Поля, по которым строятся индексы; author - каждый из авторов PEP
+INDEXED_FIELDS = ('status', 'type', 'author')
+PEP_API_ERROR_MESSAGE = 'Индекс PEP в JSON не разобран: {error}'
+# Поля, сверяемые между источниками; авторы в таблице индекса
+# сокращены до фамилий, а в JSON записаны полностью, и не сверяются
+COMPARED_FIELDS = ('title', 'type', 'status', 'url')
+COMPARE_HEAD = ('Номер', 'Поле', 'HTML', 'JSON')
+
+
+class PepRecord:
+    """Запись о PEP из таблицы numerical-index и карточки PEP."""
+
+    __slots__ = PEP_FIELDS
+
+    def __init__(self, number, title, authors, type, status, url):
+        self.number = number
+        self.title = title
+        self.authors = tuple(authors)
+        self.type = type
+        self.status = status
+        self.url = url
+
+    def values(self, field):
+        """Значения поля для индекса и группировки."""
+        if field == 'author':
+            return self.authors
+        return (getattr(self, field),)
+
+    def as_row(self):
+        return (
+            self.number, self.title, ', '.join(self.authors),
+            self.type, self.status, self.url
+        )
+
+
+class PepIndex:
+    """
+    Записи PEP с индексами по номеру, статусу, типу и автору.
+    Индексы хранят позиции записей, значения - без учёта регистра.
+    """
+
+    def __init__(self, records=()):
+        self.records = []
+        self.numbers = {}
+        self.indexes = {field: defaultdict(list) for field in INDEXED_FIELDS}
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record):
+        position = len(self.records)
+        self.records.append(record)
+        self.numbers[record.number] = position
+        for field, index in self.indexes.items():
+            for value in set(record.values(field)):
+                index[value.lower()].append(position)
+
+    def query(self, number=None, **filters):
+        """
+        Записи, подходящие под все фильтры, в порядке добавления.
+        Фильтры со значением None не применяются.
+        """
+        positions = None
+        if number is not None:
+            positions = (
+                {self.numbers[number]} if number in self.numbers else set()
+            )
+        for field, value in filters.items():
+            if value is None:
+                continue
+            found = self.indexes[field].get(value.lower(), ())
+            positions = (
+                set(found) if positions is None
+                else positions.intersection(found)
+            )
+        if positions is None:
+            return list(self.records)
+        return [self.records[position] for position in sorted(positions)]
+
+    def save(self, path=None):
+        """Атомарная запись индекса: столбцы и строки записей."""
+        path = path or pep_index_path()
+        temp_path = path.with_name(path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'fields': PEP_FIELDS,
+                'records': [
+                    [getattr(record, field) for field in PEP_FIELDS]
+                    for record in self.records
+                ],
+            }, file, ensure_ascii=False)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or pep_index_path()
+        try:
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            raise PepIndexNotFoundException(
+                PEP_INDEX_NOT_FOUND_MESSAGE.format(path=path)
+            ) from None
+        fields = data['fields']
+        return cls(
+            PepRecord(**dict(zip(fields, values)))
+            for values in data['records']
+        )
+
+
+def read_api_records(text):
+    """
+    Записи PEP из индекса peps.python.org/api/peps.json
+    в порядке номеров.
+    """
+    try:
+        return sorted((
+            PepRecord(
+                number=int(pep['number']),
+                title=pep['title'],
+                authors=pep['authors'].split(', '),
+                type=pep['type'],
+                status=pep['status'],
+                url=pep['url']
+            )
+            for pep in json.loads(text).values()
+        ), key=lambda record: record.number)
+    except (ValueError, TypeError, KeyError, AttributeError) as error:
+        raise PepApiException(
+            PEP_API_ERROR_MESSAGE.format(error=repr(error))
+        ) from error
+
+
+def compare_records(html_records, api_records):
+    """
+    Расхождения записей PEP двух источников: номер, поле и значения.
+    Для PEP, который есть только в одном источнике, выводятся все поля.
+    """
+    html = {record.number: record for record in html_records}
+    api = {record.number: record for record in api_records}
+    for number in sorted(html.keys() | api.keys()):
+        html_record, api_record = html.get(number), api.get(number)
+        for field in COMPARED_FIELDS:
+            html_value = getattr(html_record, field, None)
+            api_value = getattr(api_record, field, None)
+            if html_value != api_value:
+                yield (number, field, html_value, api_value)
+
+
+def count_by(records, field):
+    """Количество записей по значениям поля за один проход."""
+    counts = Counter()
+    for record in records:
+        counts.update(record.values(field))
+    return counts
+
+
+def pep_index_path():
+    return BASE_DIR / PEP_INDEX_FILENAME
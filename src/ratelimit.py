@@ -0,0 +1,134 @@
+import time
+from collections import deque
+from threading import Condition
+
+from constants import (AIMD_DECREASE, HOST_BURST, HOST_RATE,
+                       INITIAL_CONCURRENCY, LATENCY_SMOOTHING,
+                       LATENCY_TOLERANCE, LATENCY_WINDOW, THROTTLE_STATUSES)
+
+
+class HostLimiter:
+    """
+    Ограничение запросов к одному хосту.
+    Частота - маркерная корзина (rate запросов в секунду, запас burst),
+    число одновременных запросов подбирается по AIMD: растёт на 1 за
+    каждое «окно» успешных ответов и уменьшается в AIMD_DECREASE раз
+    на 429/503, ошибки соединения и рост задержки выше базовой.
+    Базовая задержка - наименьшая за последние LATENCY_WINDOW ответов:
+    если задержка устойчиво выросла, база догоняет её и лимит снова растёт.
+    """
+
+    def __init__(self, max_concurrency, rate=HOST_RATE, burst=HOST_BURST):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.limit = float(min(INITIAL_CONCURRENCY, self.max_concurrency))
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.latency = None
+        self.base_latency = None
+        self.samples = deque(maxlen=LATENCY_WINDOW)
+        self.cooldown = 0
+        self.waits = 0
+        self.throttled = 0
+        self._condition = Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def _wait_time(self):
+        if self.in_flight >= int(self.limit):
+            return None
+        if self.rate <= 0:
+            return 0
+        self._refill()
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Ожидание свободного места и маркера перед запросом."""
+        with self._condition:
+            waited = False
+            while True:
+                wait_time = self._wait_time()
+                if wait_time == 0:
+                    break
+                waited = True
+                self._condition.wait(wait_time)
+            if waited:
+                self.waits += 1
+            if self.rate > 0:
+                self.tokens -= 1
+            self.in_flight += 1
+
+    def release(self, latency, throttled=False):
+        """Учёт завершившегося запроса и пересчёт лимита."""
+        with self._condition:
+            self.in_flight -= 1
+            if not throttled:
+                self._observe(latency)
+            if throttled or self._is_slow():
+                self._decrease(throttled)
+            else:
+                self.limit = min(
+                    self.max_concurrency, self.limit + 1 / self.limit
+                )
+            self._condition.notify_all()
+
+    def _observe(self, latency):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+        self.samples.append(latency)
+        self.base_latency = min(self.samples)
+
+    def _is_slow(self):
+        return (
+            self.latency is not None
+            and self.latency > self.base_latency * LATENCY_TOLERANCE
+        )
+
+    def _decrease(self, throttled):
+        if throttled:
+            self.throttled += 1
+        # Одно снижение на окно запросов, отправленных при старом лимите
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+        self.limit = max(1.0, self.limit * AIMD_DECREASE)
+        self.cooldown = int(self.limit)
+
+    def state(self):
+        with self._condition:
+            return {
+                'limit': round(self.limit, 2),
+                'rate': self.rate,
+                'in_flight': self.in_flight,
+                'latency_ms': (
+                    None if self.latency is None
+                    else round(self.latency * 1000, 1)
+                ),
+                'base_latency_ms': (
+                    None if self.base_latency is None
+                    else round(self.base_latency * 1000, 1)
+                ),
+                'waits': self.waits,
+                'throttled': self.throttled,
+            }
+
+
+def is_throttled(response):
+    """Ответ или одна из повторных попыток - 429/503."""
+    if response.status_code in THROTTLE_STATUSES:
+        return True
+    retries = getattr(response.raw, 'retries', None)
+    return retries is not None and any(
+        attempt.status in THROTTLE_STATUSES for attempt in retries.history
+    )
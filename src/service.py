@@ -0,0 +1,163 @@
+import datetime as dt
+import json
+import logging
+from argparse import Namespace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from urllib.parse import urlsplit
+
+from constants import SERVE_HOST, SERVE_PORT, SERVE_REFRESH
+
+
+SERVE_START_MESSAGE = 'Сервис запущен: http://%s:%s/'
+SERVE_STOP_MESSAGE = 'Сервис остановлен'
+REFRESH_ERROR_MESSAGE = 'Ошибка обновления режима %s: %s'
+UNKNOWN_MODE_MESSAGE = 'Неизвестный режим {mode}, доступные: {modes}'
+QUERY_MESSAGE = 'Запрос %s: %s'
+
+
+class ResultsCache:
+    """
+    Результаты режимов в памяти, общие для всех запросов к сервису.
+    Обновляются в фоне раз в refresh секунд в тёплой сессии;
+    при ошибке обновления отдаются прежние результаты.
+    """
+
+    def __init__(self, session, cli_args, mode_functions,
+                 refresh=SERVE_REFRESH):
+        self.session = session
+        self.cli_args = cli_args
+        self.mode_functions = mode_functions
+        self.refresh = refresh
+        self._results = {}
+        self._locks = {mode: Lock() for mode in mode_functions}
+        self._stop = Event()
+        self._thread = None
+
+    def update(self, mode):
+        """Получение результатов режима заново."""
+        with self._locks[mode]:
+            mode_args = Namespace(**{**vars(self.cli_args), 'mode': mode})
+            rows = self.mode_functions[mode](self.session, mode_args)
+            result = {
+                'mode': mode,
+                'updated': dt.datetime.now().isoformat(timespec='seconds'),
+                'rows': rows,
+            }
+            self._results[mode] = result
+        return result
+
+    def get(self, mode):
+        """
+        Сохранённые результаты режима; до первого обновления
+        запрос ждёт, пока режим не будет выполнен.
+        """
+        result = self._results.get(mode)
+        if result is not None:
+            return result
+        with self._locks[mode]:
+            result = self._results.get(mode)
+        return result if result is not None else self.update(mode)
+
+    def updated(self):
+        return {
+            mode: self._results[mode]['updated']
+            if mode in self._results else None
+            for mode in self.mode_functions
+        }
+
+    def _refresh_loop(self):
+        while True:
+            for mode in self.mode_functions:
+                if self._stop.is_set():
+                    return
+                try:
+                    self.update(mode)
+                except Exception as error:
+                    logging.exception(REFRESH_ERROR_MESSAGE, mode, error)
+            if self._stop.wait(self.refresh):
+                return
+
+    def start(self):
+        self._thread = Thread(target=self._refresh_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class ResultsHandler(BaseHTTPRequestHandler):
+    """
+    GET / - время обновления режимов,
+    GET /<режим> - результаты режима в JSON.
+    """
+
+    def do_GET(self):
+        results = self.server.results
+        mode = urlsplit(self.path).path.strip('/')
+        if not mode:
+            self.send_json(HTTPStatus.OK, results.updated())
+        elif mode not in results.mode_functions:
+            self.send_json(HTTPStatus.NOT_FOUND, {
+                'error': UNKNOWN_MODE_MESSAGE.format(
+                    mode=mode, modes=', '.join(results.mode_functions)
+                )
+            })
+        else:
+            try:
+                self.send_json(HTTPStatus.OK, results.get(mode))
+            except Exception as error:
+                self.send_json(
+                    HTTPStatus.SERVICE_UNAVAILABLE, {'error': str(error)}
+                )
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code='-', size='-'):
+        logging.debug(QUERY_MESSAGE, self.path, code)
+
+    def log_message(self, format, *args):
+        logging.info(format, *args)
+
+
+def make_server(results, host=SERVE_HOST, port=SERVE_PORT):
+    server = ThreadingHTTPServer((host, port), ResultsHandler)
+    server.daemon_threads = True
+    server.results = results
+    return server
+
+
+def serve(session, cli_args, mode_functions):
+    """
+    Сервис с тёплой сессией: результаты режимов держатся в памяти
+    и обновляются в фоне, запросы отвечают без загрузки страниц.
+    """
+    results = ResultsCache(
+        session, cli_args, mode_functions,
+        getattr(cli_args, 'refresh', SERVE_REFRESH)
+    )
+    server = make_server(
+        results,
+        getattr(cli_args, 'host', SERVE_HOST),
+        getattr(cli_args, 'port', SERVE_PORT)
+    )
+    results.start()
+    host, port = server.server_address[:2]
+    logging.info(SERVE_START_MESSAGE, host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        results.stop()
+        logging.info(SERVE_STOP_MESSAGE)
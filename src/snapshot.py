@@ -0,0 +1,107 @@
+import json
+import mmap
+import struct
+import zlib
+from collections.abc import Mapping
+from threading import Lock
+
+from constants import SNAPSHOT_COMPRESSION
+from transport import TransportAdapter
+
+
+MAGIC = b'BS4SNAP1'
+# Смещение и длина сжатого индекса в конце файла
+TRAILER = struct.Struct('<QQ')
+SNAPSHOT_FORMAT_ERROR_MESSAGE = 'Файл {path} не является снимком парсера'
+
+
+class SnapshotWriter:
+    """
+    Запись ответов в один файл: сжатые тела подряд,
+    в конце - сжатый индекс URL -> (смещение, длина, статус, заголовки).
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.index = {}
+        self._lock = Lock()
+
+    def add(self, url, status, headers, body):
+        blob = zlib.compress(body, SNAPSHOT_COMPRESSION)
+        with self._lock:
+            offset = self.file.tell()
+            self.file.write(blob)
+            self.index[url] = (offset, len(blob), status, dict(headers))
+
+    def close(self):
+        with self._lock:
+            if self.file.closed:
+                return
+            index = zlib.compress(json.dumps(self.index).encode('utf-8'))
+            offset = self.file.tell()
+            self.file.write(index)
+            self.file.write(TRAILER.pack(offset, len(index)))
+            self.file.close()
+
+
+class SnapshotReader(Mapping):
+    """Ответы из снимка: URL -> (статус, заголовки, тело в bytes)."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if (
+            len(self.map) < len(MAGIC) + TRAILER.size
+            or self.map[:len(MAGIC)] != MAGIC
+        ):
+            raise ValueError(SNAPSHOT_FORMAT_ERROR_MESSAGE.format(path=path))
+        offset, length = TRAILER.unpack(self.map[-TRAILER.size:])
+        self.index = json.loads(
+            zlib.decompress(self.map[offset:offset + length])
+        )
+
+    def __getitem__(self, url):
+        offset, length, status, headers = self.index[url]
+        return (
+            status, headers,
+            zlib.decompress(self.map[offset:offset + length])
+        )
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+
+class RecordingAdapter(TransportAdapter):
+    """
+    Адаптер, сохраняющий в снимок GET-ответы со статусом 200:
+    частичные ответы на запросы с Range в снимок не попадают.
+    """
+
+    def __init__(self, writer, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if request.method == 'GET' and response.status_code == 200:
+            self.writer.add(
+                request.url, response.status_code, response.headers,
+                response.content
+            )
+        return response
+
+    def close(self):
+        super().close()
+        self.writer.close()
+
+
+def mount_recording(session, path, concurrency, rate):
+    """Запись всех ответов сессии в снимок path."""
+    adapter = RecordingAdapter(SnapshotWriter(path), concurrency, rate)
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    return adapter
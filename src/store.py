@@ -0,0 +1,66 @@
+import hashlib
+import json
+import sqlite3
+
+from constants import BASE_DIR, PARSE_STORE_FILENAME, STORE_TIMEOUT
+
+
+CREATE_TABLE = (
+    'CREATE TABLE IF NOT EXISTS records ('
+    'kind TEXT, url TEXT, key TEXT, record TEXT, PRIMARY KEY (kind, url))'
+)
+SELECT_RECORD = 'SELECT key, record FROM records WHERE kind = ? AND url = ?'
+UPSERT_RECORD = 'INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)'
+
+
+def response_key(response):
+    """Ключ версии страницы: валидатор ответа или хеш содержимого."""
+    for header in ('ETag', 'Last-Modified'):
+        if response.headers.get(header):
+            return f'{header}: {response.headers[header]}'
+    return hashlib.sha1(response.content).hexdigest()
+
+
+class ParseStore:
+    """
+    Хранилище результатов разбора страниц.
+    Запись возвращается, только если страница не изменилась.
+    """
+
+    def __init__(self, path=':memory:'):
+        # Хранилище может быть открыто в нескольких режимах одного запуска:
+        # каждая запись фиксируется сразу, чтобы транзакция не оставалась
+        # открытой на время загрузки страниц, а WAL не блокирует чтение
+        self.connection = sqlite3.connect(
+            str(path), timeout=STORE_TIMEOUT, isolation_level=None
+        )
+        if str(path) != ':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(CREATE_TABLE)
+
+    def get(self, kind, url, key):
+        row = self.connection.execute(SELECT_RECORD, (kind, url)).fetchone()
+        if row is None or row[0] != key:
+            return None
+        return tuple(json.loads(row[1]))
+
+    def set(self, kind, url, key, record):
+        self.connection.execute(
+            UPSERT_RECORD, (kind, url, key, json.dumps(record))
+        )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_store(cli_args):
+    """Постоянное хранилище для запуска из командной строки."""
+    if getattr(cli_args, 'parse_store', False):
+        return ParseStore(BASE_DIR / PARSE_STORE_FILENAME)
+    return ParseStore()
@@ -0,0 +1,195 @@
+import random
+import time
+from io import BytesIO
+from threading import Lock
+from urllib.parse import urlparse
+
+from requests import ConnectionError, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from constants import (BACKOFF_FACTOR, BACKOFF_JITTER, CONCURRENCY,
+                       CONNECT_TIMEOUT, HOST_RATE, READ_TIMEOUT, RETRIES,
+                       RETRY_STATUSES)
+from ratelimit import HostLimiter, is_throttled
+
+
+REPLAY_MISSING_MESSAGE = 'Страница {url} отсутствует в сохранённых ответах'
+REPLAY_REASON = 'Replayed'
+
+
+class TransportStats:
+    """
+    Счётчики повторных запросов и ожиданий свободного соединения,
+    состояние ограничителей запросов по хостам.
+    """
+
+    def __init__(self):
+        self.retries = 0
+        self.pool_waits = 0
+        self.hosts = {}
+        self._lock = Lock()
+
+    def add(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        stats = {'retries': self.retries, 'pool_waits': self.pool_waits}
+        if self.hosts:
+            stats['hosts'] = {
+                host: limiter.state() for host, limiter in self.hosts.items()
+            }
+        return stats
+
+
+class JitterRetry(Retry):
+    """Экспоненциальная задержка со случайной добавкой и подсчётом попыток."""
+
+    stats = None
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.stats = self.stats
+        return retry
+
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)
+        if self.stats is not None:
+            self.stats.add('retries')
+        return retry
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return backoff
+        return backoff + random.uniform(0, BACKOFF_JITTER)
+
+
+def _counting_pool(pool_class, stats):
+    def _get_conn(self, timeout=None):
+        # Очередь пуста - все соединения заняты, запрос будет ждать
+        if self.pool is not None and self.pool.empty():
+            stats.add('pool_waits')
+        return pool_class._get_conn(self, timeout)
+
+    return type(pool_class.__name__, (pool_class,), {'_get_conn': _get_conn})
+
+
+class TransportAdapter(HTTPAdapter):
+    """
+    Адаптер с пулом соединений на хост, таймаутами по умолчанию,
+    повтором запросов при 5xx/429 и обрывах соединения
+    и ограничением частоты и параллельности запросов к хосту.
+    """
+
+    def __init__(self, concurrency=CONCURRENCY, rate=HOST_RATE,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.stats = TransportStats()
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.rate = rate
+        self._limiters_lock = Lock()
+        retry = JitterRetry(
+            total=RETRIES,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False,
+        )
+        retry.stats = self.stats
+        super().__init__(
+            pool_maxsize=max(concurrency, 1),
+            pool_block=True,
+            max_retries=retry,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self.stats),
+            'https': _counting_pool(HTTPSConnectionPool, self.stats),
+        }
+
+    def limiter(self, url):
+        host = urlparse(url).netloc
+        with self._limiters_lock:
+            if host not in self.stats.hosts:
+                self.stats.hosts[host] = HostLimiter(
+                    self.concurrency, self.rate
+                )
+            return self.stats.hosts[host]
+
+    def send(self, request, timeout=None, **kwargs):
+        limiter = self.limiter(request.url)
+        limiter.acquire()
+        start = time.monotonic()
+        # Ошибка соединения - такой же признак перегрузки, как 429
+        throttled = True
+        try:
+            response = super().send(
+                request,
+                timeout=self.timeout if timeout is None else timeout,
+                **kwargs
+            )
+            throttled = is_throttled(response)
+            return response
+        finally:
+            limiter.release(time.monotonic() - start, throttled)
+
+
+def mount_transport(session, concurrency=CONCURRENCY, rate=HOST_RATE):
+    """Подключение адаптера к сессии для http и https."""
+    adapter = TransportAdapter(concurrency, rate)
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    return adapter
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Адаптер, отдающий заранее сохранённые ответы без обращения к сети.
+    pages: URL -> (статус, заголовки, тело в bytes).
+    На HEAD-запрос отдаются заголовки сохранённого GET-ответа.
+    Заголовок Range не учитывается: отдаётся полный ответ со статусом 200.
+    """
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.stats = TransportStats()
+
+    def send(self, request, **kwargs):
+        if request.url not in self.pages:
+            raise ConnectionError(REPLAY_MISSING_MESSAGE.format(
+                url=request.url
+            ))
+        status, headers, body = self.pages[request.url]
+        if status == 206:
+            # Частичный ответ из старого снимка нельзя отдать как полный
+            raise ConnectionError(REPLAY_MISSING_MESSAGE.format(
+                url=request.url
+            ))
+        if request.method == 'HEAD':
+            body = b''
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.reason = REPLAY_REASON
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def mount_replay(session, pages):
+    """Подключение ReplayAdapter к сессии для http и https."""
+    adapter = ReplayAdapter(pages)
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    return adapter
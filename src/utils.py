@@ -1,19 +1,64 @@
-from bs4 import BeautifulSoup
-from requests import RequestException
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from threading import Lock
 
-from exceptions import ParserFindTagException
+from constants import CONCURRENCY, DOWNLOAD_CHUNK_SIZE, STREAM_CHUNK_SIZE
+from exceptions import ArchiveIntegrityException, ParserFindTagException
+from metrics import METRICS, timed
 
 
 HTTP_GET_ERROR_MESSAGE = (
     'При загрузке страницы {url} возникла ошибка {error}'
 )
 FIND_TAG_ERROR_MESSAGE = 'Не найден тег {tag} {attrs}'
+ARCHIVE_INTEGRITY_ERROR_MESSAGE = 'Архив {path} повреждён: {error}'
+ETAG_SUFFIX = '.etag'
+# Отметка о полностью загруженном архиве, внутри - его ETag
+COMPLETE_SUFFIX = '.complete'
+# Запрос мимо HTTP-кеша без отключения кеша для всей сессии
+NO_STORE_HEADERS = {'Cache-Control': 'no-store'}
+# Перепроверка записи кеша условным запросом, даже если она не устарела
+REVALIDATE_HEADERS = {'Cache-Control': 'must-revalidate'}
 
 
-def get_response(session, url, encoding='utf-8'):
+# Загружаемые сейчас страницы: (сессия, URL) -> Future с ответом
+_in_flight = {}
+_in_flight_lock = Lock()
+
+
+def _read_head(session, url, encoding, headers, head_tags):
+    """
+    Потоковая загрузка страницы до конца первых элементов head_tags.
+    Тело ответа заменяется прочитанным началом страницы, соединение
+    закрывается, не дочитывая остальное. Ответ, который записывается
+    в HTTP-кеш, читается кешем целиком, и начало берётся из памяти.
+    """
+    from extractors import read_head
+
+    with session.get(url, headers=headers, stream=True) as response:
+        content, aborted = read_head(
+            response.iter_content(STREAM_CHUNK_SIZE), head_tags, encoding
+        )
+    if aborted:
+        METRICS.count('stream_aborted')
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+def _load(session, url, encoding, headers=None, head_tags=None):
+    from requests import RequestException
+
     try:
-        response = session.get(url)
+        start = time.perf_counter()
+        if head_tags is None:
+            response = session.get(url, headers=headers)
+        else:
+            response = _read_head(session, url, encoding, headers, head_tags)
         response.encoding = encoding
+        METRICS.record_response(response, time.perf_counter() - start)
         return response
     except RequestException as error:
         raise ConnectionError(
@@ -21,6 +66,164 @@ def get_response(session, url, encoding='utf-8'):
         )
 
 
+def get_response(session, url, encoding='utf-8', headers=None,
+                 head_tags=None):
+    """
+    Загрузка страницы.
+    Одновременные запросы одного URL в одной сессии (например, из разных
+    режимов) выполняются один раз и получают общий ответ.
+    С head_tags загружается только начало страницы до этих тегов.
+    """
+    key = (id(session), url, head_tags)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        loader = future is None
+        if loader:
+            future = _in_flight[key] = Future()
+    if loader:
+        try:
+            future.set_result(
+                _load(session, url, encoding, headers, head_tags)
+            )
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            with _in_flight_lock:
+                del _in_flight[key]
+    else:
+        METRICS.count('deduplicated')
+    return future.result()
+
+
+def _get_response_or_error(session, url, encoding, headers, head_tags):
+    try:
+        return get_response(session, url, encoding, headers, head_tags)
+    except ConnectionError as error:
+        return error
+
+
+def _bounded_map(executor, func, items, window):
+    """executor.map, опережающий потребителя не больше чем на window."""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_responses(session, urls, concurrency=CONCURRENCY, encoding='utf-8',
+                   window=None, headers=None, head_tags=None):
+    """
+    Конкурентная загрузка страниц.
+    Ответы отдаются по мере готовности в порядке urls, вместо ответа
+    на неудачный запрос отдаётся исключение ConnectionError.
+    С window в памяти держится не больше window загруженных ответов.
+    С head_tags страницы читаются только до конца этих тегов.
+    """
+    from tqdm import tqdm
+
+    urls = list(urls)
+    load = partial(
+        _get_response_or_error, session, encoding=encoding, headers=headers,
+        head_tags=head_tags
+    )
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        yield from tqdm(
+            executor.map(load, urls) if window is None
+            else _bounded_map(executor, load, urls, max(window, 1)),
+            total=len(urls)
+        )
+
+
+def _is_downloaded(path, complete_path, size, etag):
+    if size is None or not path.exists() or path.stat().st_size != size:
+        return False
+    return complete_path.exists() and complete_path.read_text() == (
+        etag or ''
+    )
+
+
+def _resume_offset(path, etag_path, size, etag):
+    """
+    Байт, с которого продолжается загрузка: недокачанный файл
+    продолжается, только если он начат с той же версии архива (ETag).
+    """
+    if etag is None or size is None or not path.exists():
+        return 0
+    if not etag_path.exists() or etag_path.read_text() != etag:
+        return 0
+    offset = path.stat().st_size
+    return offset if offset < size else 0
+
+
+def _check_zip(path):
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(path) as archive:
+            broken = archive.testzip()
+    except zipfile.BadZipFile as error:
+        broken = error
+    if broken is not None:
+        path.unlink()
+        raise ArchiveIntegrityException(
+            ARCHIVE_INTEGRITY_ERROR_MESSAGE.format(path=path, error=broken)
+        )
+
+
+@timed
+def download_file(session, url, path, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                  full=False):
+    """
+    Потоковая загрузка архива мимо HTTP-кеша.
+    ETag загружаемой версии сохраняется рядом с файлом до начала загрузки;
+    недокачанный файл той же версии продолжается запросом с Range
+    и If-Range, другая версия загружается с начала. Полностью загруженный
+    архив с совпадающими размером и ETag повторно не загружается.
+    С full архив всегда загружается целиком (запись снимка).
+    Возвращает False, если загрузка не потребовалась.
+    """
+    from requests import RequestException
+
+    etag_path = path.with_name(path.name + ETAG_SUFFIX)
+    complete_path = path.with_name(path.name + COMPLETE_SUFFIX)
+    try:
+        head = session.head(
+            url, headers=NO_STORE_HEADERS, allow_redirects=True
+        )
+        size = head.headers.get('Content-Length')
+        size = int(size) if size is not None else None
+        etag = head.headers.get('ETag')
+        if not full and _is_downloaded(path, complete_path, size, etag):
+            return False
+        headers = dict(NO_STORE_HEADERS)
+        offset = 0 if full else _resume_offset(path, etag_path, size, etag)
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = etag_path.read_text()
+        complete_path.unlink(missing_ok=True)
+        if etag is not None:
+            etag_path.write_text(etag)
+        else:
+            etag_path.unlink(missing_ok=True)
+        with session.get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            mode = 'ab' if response.status_code == 206 else 'wb'
+            with open(path, mode) as file:
+                for chunk in response.iter_content(chunk_size):
+                    file.write(chunk)
+    except RequestException as error:
+        raise ConnectionError(
+            HTTP_GET_ERROR_MESSAGE.format(url=url, error=error),
+        )
+    _check_zip(path)
+    complete_path.write_text(etag or '')
+    return True
+
+
+@timed
 def find_tag(soup, tag, attrs=None):
     """Перехват ошибки поиска тегов."""
     searched_tag = soup.find(tag, attrs=({} if attrs is None else attrs))
@@ -31,8 +234,13 @@ def find_tag(soup, tag, attrs=None):
     return searched_tag
 
 
+@timed
+def make_soup(response, features='lxml'):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(response.text, features=features)
+
+
+@timed
 def create_soup(session, url, features='lxml'):
-    return BeautifulSoup(
-        get_response(session, url).text,
-        features=features
-    )
+    return make_soup(get_response(session, url), features=features)
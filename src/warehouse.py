@@ -0,0 +1,71 @@
+import datetime as dt
+import json
+import sqlite3
+from contextlib import closing
+
+from constants import (BASE_DIR, DATETIME_FORMAT, MODE_KEY_COLUMNS,
+                       WAREHOUSE_FILENAME)
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mode TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    head TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rows (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    mode TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    row TEXT NOT NULL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS runs_mode ON runs (mode, id);
+CREATE INDEX IF NOT EXISTS rows_mode_key ON rows (mode, key);
+'''
+INSERT_RUN = 'INSERT INTO runs (mode, started_at, head) VALUES (?, ?, ?)'
+# Повтор ключа в запуске - ошибка, а не замена строки
+INSERT_ROW = 'INSERT INTO rows VALUES (?, ?, ?, ?, ?)'
+
+
+def warehouse_path():
+    return BASE_DIR / WAREHOUSE_FILENAME
+
+
+def row_key(mode, row):
+    """
+    Ключ строки: первый столбец или, для режимов из MODE_KEY_COLUMNS,
+    несколько первых столбцов через двоеточие.
+    """
+    return ':'.join(map(str, row[:MODE_KEY_COLUMNS.get(mode, 1)]))
+
+
+def connect(path=None):
+    connection = sqlite3.connect(str(path or warehouse_path()))
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def save_run(mode, results, path=None):
+    """
+    Сохранение строк запуска одной транзакцией.
+    Первая строка results - заголовок, ключ строки - row_key.
+    Строки с одинаковым ключом вызывают sqlite3.IntegrityError.
+    Возвращает id запуска.
+    """
+    rows = iter(results)
+    head = next(rows)
+    with closing(connect(path)) as connection, connection:
+        run_id = connection.execute(INSERT_RUN, (
+            mode,
+            dt.datetime.now().strftime(DATETIME_FORMAT),
+            json.dumps(head, ensure_ascii=False)
+        )).lastrowid
+        connection.executemany(INSERT_ROW, (
+            (run_id, mode, row_key(mode, row), position,
+             json.dumps(row, ensure_ascii=False))
+            for position, row in enumerate(rows)
+        ))
+    return run_id
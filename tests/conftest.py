@@ -110,3 +110,17 @@ def records():
         result = results[mode]
         return converting(result)
     return _records
+
+
+@pytest.fixture
+def site_session(mock_session):
+    """Сессия, отдающая локальные копии страниц документации и PEP."""
+    from tests.fixture_data.pages import site_pages
+    adapter = Adapter()
+    for url, text in site_pages().items():
+        adapter.register_uri(
+            'GET', url, text=text, headers={'Content-Type': 'text/html'}
+        )
+    mock_session.mount('https://', adapter)
+    mock_session.site_adapter = adapter
+    yield mock_session
@@ -0,0 +1,66 @@
+PEP_INDEX = '''
+<html><body>
+<section id="numerical-index">
+<table><tbody>
+<tr><td><abbr>PF</abbr></td><td><a href="pep-0001/">1</a></td>
+<td>PEP Purpose and Guidelines</td><td>Warsaw, Hylton</td></tr>
+<tr><td><abbr>SA</abbr></td><td><a href="pep-0008/">8</a></td>
+<td>Style Guide for Python Code</td><td>GvR, Warsaw</td></tr>
+<tr><td><abbr>S</abbr></td><td><a href="pep-0695/">695</a></td>
+<td>Type Parameter Syntax</td><td>Traut</td></tr>
+</tbody></table>
+</section>
+</body></html>
+'''
+PEP_PAGE = '''
+<html><body><section>
+<h1>PEP {number}</h1>
+<dl class="rfc2822 field-list simple">
+<dt class="field-odd">Author<span class="colon">:</span></dt>
+<dd class="field-odd">Someone</dd>
+<dt class="field-even">Status<span class="colon">:</span></dt>
+<dd class="field-even"><abbr>{status}</abbr></dd>
+</dl>
+<p>{body}</p>
+</section></body></html>
+'''
+WHATS_NEW_INDEX = '''
+<html><body>
+<section id="what-s-new-in-python">
+<div class="toctree-wrapper compound"><ul>
+<li class="toctree-l1"><a href="3.12.html">What's New In Python 3.12</a></li>
+<li class="toctree-l1"><a href="3.11.html">What's New In Python 3.11</a></li>
+</ul></div>
+</section>
+</body></html>
+'''
+WHATS_NEW_PAGE = '''
+<html><body><section>
+<h1>What's New In Python {version}</h1>
+<dl class="field-list simple">
+<dt class="field-odd">Editor<span class="colon">:</span></dt>
+<dd class="field-odd"><p>Guido</p>
+</dd>
+</dl>
+<p>{body}</p>
+</section></body></html>
+'''
+PEP_STATUSES = {'0001': 'Active', '0008': 'Active', '0695': 'Final'}
+WHATS_NEW_VERSIONS = ('3.12', '3.11')
+
+
+def site_pages():
+    """Страницы docs.python.org и peps.python.org по URL."""
+    pages = {
+        'https://peps.python.org/': PEP_INDEX,
+        'https://docs.python.org/3/whatsnew/': WHATS_NEW_INDEX,
+    }
+    for number, status in PEP_STATUSES.items():
+        pages[f'https://peps.python.org/pep-{number}/'] = PEP_PAGE.format(
+            number=int(number), status=status, body='Lorem ipsum ' * 200
+        )
+    for version in WHATS_NEW_VERSIONS:
+        pages[f'https://docs.python.org/3/whatsnew/{version}.html'] = (
+            WHATS_NEW_PAGE.format(version=version, body='Lorem ipsum ' * 200)
+        )
+    return pages
@@ -0,0 +1,90 @@
+import sqlite3
+
+import pytest
+from requests_mock import Adapter
+try:
+    from src import cache
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache.py`'
+
+PAGE_URL = 'https://peps.python.org/pep-{:04}/'
+ARCHIVE_URL = 'https://docs.python.org/3/archives/python-docs-pdf-a4.zip'
+
+
+@pytest.fixture
+def make_session(tmp_path):
+    def _make_session(max_size=cache.CACHE_SIZE * cache.MEGABYTE):
+        adapter = Adapter()
+        for number in range(3):
+            adapter.register_uri(
+                'GET', PAGE_URL.format(number),
+                text='You are breathtaken! ' * 1000,
+                headers={'Content-Type': 'text/html; charset=utf-8'}
+            )
+        adapter.register_uri(
+            'GET', ARCHIVE_URL, content=b'PK' * 1000,
+            headers={'Content-Type': 'application/zip'}
+        )
+        session = cache.UsageTrackingSession(
+            str(tmp_path / 'http_cache'),
+            serializer=cache.compressed_serializer(),
+            filter_fn=cache.is_cacheable,
+            max_size=max_size
+        )
+        session.mount('https://', adapter)
+        return session
+    return _make_session
+
+
+def stored_values(path):
+    connection = sqlite3.connect(str(path))
+    try:
+        return [value for value, in connection.execute(
+            'SELECT value FROM responses'
+        )]
+    finally:
+        connection.close()
+
+
+def test_compressed_cache_and_stats(make_session, tmp_path):
+    with make_session() as session:
+        assert not session.get(PAGE_URL.format(0)).from_cache
+        assert session.get(PAGE_URL.format(0)).from_cache
+        session.get(ARCHIVE_URL)
+        assert not session.get(ARCHIVE_URL).from_cache
+    path = tmp_path / 'http_cache.sqlite'
+    value, = stored_values(path)
+    assert value[:1] == cache.ZLIB_HEADER
+    assert len(value) < len('You are breathtaken! ' * 1000)
+    head, *hosts, total = cache.cache_stats_rows(path=path)
+    assert head == cache.CACHE_STATS_HEAD
+    assert hosts == [
+        ('docs.python.org', 0, 0, 0, 2, '0%'),
+        ('peps.python.org', 1, len(value), 1, 1, '50%'),
+    ]
+    assert total == ('Всего', 1, len(value), 1, 3, '25%')
+
+
+def test_prune_removes_least_recently_used(make_session, tmp_path):
+    with make_session() as session:
+        for number in (0, 1, 2):
+            session.get(PAGE_URL.format(number))
+        session.get(PAGE_URL.format(0))
+    path = tmp_path / 'http_cache.sqlite'
+    sizes = sorted(len(value) for value in stored_values(path))
+    with make_session(max_size=sum(sizes[1:])) as session:
+        pass
+    assert len(stored_values(path)) == 2
+    with make_session() as session:
+        assert session.get(PAGE_URL.format(0)).from_cache
+        assert session.get(PAGE_URL.format(2)).from_cache
+        assert not session.get(PAGE_URL.format(1)).from_cache
+    assert cache.prune(0, path)[0] == 3
+    assert stored_values(path) == []
+
+
+def test_uncompressed_entries_are_readable():
+    data = b'\x80\x05uncompressed pickle'
+    assert cache._decompress(data) == data
@@ -1,5 +1,6 @@
 import pytest
 import argparse
+from datetime import timedelta
 try:
     from src import configs
 except ModuleNotFoundError:
@@ -29,7 +30,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'sqlite', 'jsonl', 'table'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +65,40 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('argv, expire_after', [
+    (['pep'], timedelta(hours=1)),
+    (['pep', '--expire-after', '60'], 60),
+    (['pep-compare'], timedelta(hours=1)),
+    (['whats-new', 'pep-compare'], timedelta(hours=1)),
+    (['serve', '--refresh', '60'], timedelta(seconds=60)),
+])
+def test_configure_session(monkeypatch, tmp_path, argv, expire_after):
+    monkeypatch.chdir(tmp_path)
+    cli_args = configs.configure_argument_parser(
+        [
+            'whats-new', 'latest-versions', 'download', 'pep',
+            'pep-compare', 'serve'
+        ]
+    ).parse_args(argv)
+    session = configs.configure_session(cli_args)
+    settings = session.settings
+    assert settings.expire_after == expire_after
+    assert 'peps.python.org/pep-*' in settings.urls_expire_after
+    assert settings.stale_while_revalidate is False
+    session.close()
+
+
+def test_configure_session_serve_caps_url_expiry(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    cli_args = configs.configure_argument_parser(
+        ['pep', 'serve']
+    ).parse_args(['serve', '--refresh', '60'])
+    session = configs.configure_session(cli_args)
+    assert session.settings.urls_expire_after
+    assert all(
+        expire <= timedelta(seconds=60)
+        for expire in session.settings.urls_expire_after.values()
+    )
+    session.close()
@@ -0,0 +1,68 @@
+import pytest
+try:
+    from src import diff
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `diff.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `diff.py`'
+
+HEAD = ('Ссылка', 'Заголовок')
+
+
+def test_diff_rows(tmp_path):
+    path = tmp_path / 'results.sqlite'
+    first = [HEAD, ('a', 'A'), ('b', 'B'), ('c', 'C')]
+    assert list(diff.diff_rows(first, 'whats-new', path)) == [
+        ('Изменение', *HEAD),
+        ('added', 'a', 'A'), ('added', 'b', 'B'), ('added', 'c', 'C'),
+    ]
+    second = [HEAD, ('a', 'A'), ('c', 'C2'), ('d', 'D')]
+    assert list(diff.diff_rows(iter(second), 'whats-new', path)) == [
+        ('Изменение', *HEAD),
+        ('changed', 'c', 'C2'), ('added', 'd', 'D'), ('removed', 'b', 'B'),
+    ]
+    assert list(diff.diff_rows(second, 'whats-new', path)) == [
+        ('Изменение', *HEAD)
+    ]
+    # Запуски разных режимов сравниваются отдельно
+    assert len(list(diff.diff_rows(second, 'pep', path))) == 4
+
+
+def test_unfinished_run_is_not_saved(tmp_path):
+    path = tmp_path / 'results.sqlite'
+
+    def rows():
+        yield HEAD
+        yield ('a', 'A')
+        raise ConnectionError('breathtaken')
+
+    try:
+        list(diff.diff_rows(rows(), 'pep', path))
+    except ConnectionError:
+        pass
+    assert list(diff.diff_rows([HEAD, ('a', 'A')], 'pep', path)) == [
+        ('Изменение', *HEAD), ('added', 'a', 'A')
+    ]
+
+
+def test_diff_rows_compound_key(tmp_path):
+    path = tmp_path / 'results.sqlite'
+    rows = [
+        ('Номер', 'Поле', 'HTML', 'JSON'),
+        (695, 'title', 'Type Params', 'Type Parameter Syntax'),
+        (695, 'status', 'Final', 'Accepted'),
+        ('Всего', 2, '', ''),
+    ]
+    assert len(list(diff.diff_rows(rows, 'pep-compare', path))) == 4
+    assert list(diff.diff_rows(rows, 'pep-compare', path)) == [
+        ('Изменение', *rows[0])
+    ]
+
+
+def test_duplicate_key_is_rejected(tmp_path):
+    import sqlite3
+
+    from warehouse import save_run
+
+    with pytest.raises(sqlite3.IntegrityError):
+        save_run('pep', [HEAD, ('a', 'A'), ('a', 'B')], tmp_path / 'r.db')
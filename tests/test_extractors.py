@@ -0,0 +1,70 @@
+import pytest
+try:
+    from src import extractors
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+
+
+@pytest.fixture
+def page_response(site_session):
+    def _page_response(url):
+        return site_session.get(url)
+    return _page_response
+
+
+@pytest.mark.parametrize('url', [
+    'https://peps.python.org/pep-0001/',
+    'https://peps.python.org/pep-0695/',
+])
+def test_pep_status_backends_match(page_response, url):
+    response = page_response(url)
+    assert (
+        extractors.pep_status_lxml(response)
+        == extractors.pep_status_bs4(response)
+    )
+
+
+@pytest.mark.parametrize('url', [
+    'https://docs.python.org/3/whatsnew/3.12.html',
+    'https://docs.python.org/3/whatsnew/3.11.html',
+])
+def test_version_info_backends_match(page_response, url):
+    response = page_response(url)
+    assert (
+        extractors.version_info_lxml(response)
+        == extractors.version_info_bs4(response)
+    )
+
+
+def test_lxml_backend_missing_tag(page_response):
+    response = page_response('https://peps.python.org/')
+    with pytest.raises(BaseException) as excinfo:
+        extractors.version_info_lxml(response)
+    assert excinfo.typename == 'ParserFindTagException'
+
+
+def test_iter_pep_index(page_response):
+    response = page_response('https://peps.python.org/')
+    assert list(extractors.iter_pep_index(response)) == [
+        ('PF', '1', 'pep-0001/', 'PEP Purpose and Guidelines',
+         'Warsaw, Hylton'),
+        ('SA', '8', 'pep-0008/', 'Style Guide for Python Code',
+         'GvR, Warsaw'),
+        ('S', '695', 'pep-0695/', 'Type Parameter Syntax', 'Traut'),
+    ]
+
+
+def test_read_head():
+    page = (
+        b'<html><body><h1>PEP 8</h1><dl><dt>Author</dt>'
+        b'<dd><dl><dt>Nested</dt></dl></dd><dt>Status</dt><dd>Active</dd>'
+        b'</dl><p>Lorem ipsum</p><p>Lorem ipsum</p></body></html>'
+    )
+    chunks = [page[start:start + 16] for start in range(0, len(page), 16)]
+    head, aborted = extractors.read_head(iter(chunks), ('h1', 'dl'))
+    assert aborted
+    assert b'Active</dd></dl>' in head
+    assert len(head) < len(page)
+    assert extractors.read_head(iter(chunks), ('table',)) == (page, False)
@@ -0,0 +1,48 @@
+import json
+import logging
+from logging.handlers import QueueListener
+from queue import SimpleQueue
+
+try:
+    from src import logger
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `logger.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `logger.py`'
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def test_json_records_are_formatted_by_listener():
+    handler = ListHandler()
+    handler.setFormatter(logger.JsonFormatter())
+    log_queue = SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    test_logger = logging.getLogger('test_logger')
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.addHandler(logger.LocalQueueHandler(log_queue))
+    listener.start()
+    try:
+        test_logger.debug('Не форматируется: %s', object())
+        test_logger.info('Страница %s загружена', 'pep-0008')
+        try:
+            raise ValueError('breathtaken')
+        except ValueError:
+            test_logger.exception('Ошибка: %s', 'breathtaken')
+    finally:
+        listener.stop()
+        test_logger.handlers.clear()
+    info, error = [json.loads(line) for line in handler.lines]
+    assert info['level'] == 'INFO'
+    assert info['message'] == 'Страница pep-0008 загружена'
+    assert info['logger'] == 'test_logger'
+    assert error['message'] == 'Ошибка: breathtaken'
+    assert 'ValueError: breathtaken' in error['exception']
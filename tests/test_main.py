@@ -1,4 +1,5 @@
 import pytest
+from argparse import Namespace
 from pathlib import Path
 try:
     from src import main
@@ -140,3 +141,230 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+@pytest.mark.parametrize('backend', ['lxml', 'bs4'])
+def test_pep_offline(site_session, backend):
+    got = main.pep(site_session, Namespace(backend=backend))
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Active', 2),
+        ('Final', 1),
+        ('Всего', 3),
+    ]
+
+
+@pytest.mark.parametrize('backend', ['lxml', 'bs4'])
+def test_whats_new_offline(site_session, backend):
+    got = main.whats_new(site_session, Namespace(backend=backend))
+    assert got == [
+        ('Ссылка на статью', 'Заголовок', 'Редактор, Автор'),
+        (
+            'https://docs.python.org/3/whatsnew/3.12.html',
+            "What's New In Python 3.12", ' Editor: Guido  '
+        ),
+        (
+            'https://docs.python.org/3/whatsnew/3.11.html',
+            "What's New In Python 3.11", ' Editor: Guido  '
+        ),
+    ]
+
+
+def test_parse_store_skips_unchanged_pages(monkeypatch, site_session):
+    import extractors
+    from store import ParseStore
+    store = ParseStore()
+    monkeypatch.setattr(main, 'open_store', lambda cli_args: store)
+    monkeypatch.setattr(store, 'close', lambda: None)
+    expected = main.pep(site_session)
+    monkeypatch.setitem(extractors.PEP_STATUS_EXTRACTORS, 'lxml', None)
+    assert main.pep(site_session) == expected
+
+
+
+def test_parse_store_commits_every_write(tmp_path):
+    from store import ParseStore
+    path = tmp_path / 'store.sqlite'
+    writer, reader = ParseStore(path), ParseStore(path)
+    writer.set('pep', 'https://peps.python.org/pep-0001/', 'k', ['Active'])
+    # Запись видна другому соединению без закрытия первого
+    assert reader.get('pep', 'https://peps.python.org/pep-0001/', 'k') == (
+        'Active',
+    )
+    assert not writer.connection.in_transaction
+    writer.close()
+    reader.close()
+
+def test_pep_rows_streams_head_first(site_session):
+    rows = main.pep_rows(site_session)
+    assert next(rows) == ('Статус', 'Количество')
+    assert list(rows)[-1] == ('Всего', 3)
+
+
+@pytest.mark.parametrize('backend', ['lxml', 'bs4'])
+def test_pep_process_pool(site_session, backend):
+    from metrics import METRICS
+
+    cli_args = Namespace(backend=backend, workers=2)
+    METRICS.reset()
+    got = main.pep(site_session, cli_args)
+    # Время разбора в процессах-обработчиках учитывается в метриках
+    assert METRICS.phases[f'pep_status_{backend}'][0] == 3
+    assert got == main.pep(site_session)
+    assert main.whats_new(site_session, cli_args) == main.whats_new(
+        site_session
+    )
+
+
+def test_run_modes_batch(capsys, site_session):
+    cli_args = Namespace(
+        mode=main.expand_modes(['pep', 'whats-new', 'pep']), output=None
+    )
+    assert cli_args.mode == ['pep', 'whats-new']
+    main.run_modes(site_session, cli_args)
+    captured_out, _ = capsys.readouterr()
+    assert captured_out.index('Всего 3') < captured_out.index(
+        "What's New In Python 3.12"
+    )
+
+
+def test_expand_all_modes():
+    assert main.expand_modes(['pep', 'all']) == list(main.MODE_TO_FUNCTION)
+
+
+def test_query_pep_index(monkeypatch, tmp_path, site_session):
+    import peps
+    monkeypatch.setattr(peps, 'BASE_DIR', tmp_path)
+    main.pep(site_session, Namespace(pep_index=True))
+    query_args = Namespace(
+        number=None, status=None, type='Standards Track', author=None,
+        group_by=None
+    )
+    got = list(main.query_rows(query_args))
+    assert got[0] == main.QUERY_HEAD
+    assert [row[0] for row in got[1:]] == [8, 695]
+    query_args.group_by = 'author'
+    assert list(main.query_rows(query_args)) == [
+        ('Автор', 'Количество'), ('GvR', 1), ('Warsaw', 1), ('Traut', 1),
+        (main.PEPS_TAIL, 2)
+    ]
+
+
+def test_pep_low_memory(site_session):
+    assert main.pep(site_session, Namespace(low_memory=True)) == main.pep(
+        site_session
+    )
+
+
+@pytest.fixture
+def pep_api(site_session):
+    text = (
+        Path(__file__).parent / 'fixture_data' / 'peps.json'
+    ).read_text(encoding='utf-8')
+    site_session.site_adapter.register_uri(
+        'GET', 'https://peps.python.org/api/peps.json', text=text,
+        headers={'Content-Type': 'application/json'}
+    )
+    return site_session
+
+
+def test_expand_modes_prefetch_first():
+    assert main.expand_modes(['pep', 'prefetch']) == ['prefetch', 'pep']
+    assert main.expand_modes(['prefetch', 'all']) == [
+        'prefetch', *main.MODE_TO_FUNCTION
+    ]
+
+
+def test_prefetch_covers_modes(pep_api):
+    adapter = pep_api.site_adapter
+    adapter.register_uri('GET', 'https://docs.python.org/3/', text='')
+    main.prefetch(pep_api)
+    prefetched = {request.url for request in adapter.request_history}
+    assert all(
+        request.headers['Cache-Control'] == 'must-revalidate'
+        for request in adapter.request_history
+    )
+    adapter.reset()
+    main.pep(pep_api)
+    main.pep(pep_api, Namespace(source='api'))
+    main.whats_new(pep_api)
+    requested = {request.url for request in adapter.request_history}
+    assert requested <= prefetched
+
+
+def test_pep_api_source(pep_api):
+    adapter = pep_api.site_adapter
+    got = main.pep(pep_api, Namespace(source='api'))
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Active', 2),
+        ('Accepted', 1),
+        ('Всего', 3),
+    ]
+    assert [request.url for request in adapter.request_history] == [
+        'https://peps.python.org/api/peps.json'
+    ]
+
+
+def test_pep_api_fallback(site_session):
+    site_session.site_adapter.register_uri(
+        'GET', 'https://peps.python.org/api/peps.json',
+        text='<html>Not Found</html>', status_code=404
+    )
+    assert main.pep(site_session, Namespace(source='api')) == main.pep(
+        site_session
+    )
+
+
+def test_pep_compare(pep_api):
+    assert list(main.pep_compare_rows(pep_api)) == [
+        ('Номер', 'Поле', 'HTML', 'JSON'),
+        (695, 'status', 'Final', 'Accepted'),
+        ('Всего', 1, '', ''),
+    ]
+
+
+def test_pep_compare_pretty_output(capsys, pep_api):
+    from outputs import control_output
+
+    control_output(
+        main.pep_compare_rows(pep_api),
+        Namespace(mode='pep-compare', output='pretty')
+    )
+    captured_out, _ = capsys.readouterr()
+    assert 'Accepted' in captured_out
+    assert 'Всего' in captured_out
+
+
+@pytest.mark.parametrize('backend', ['lxml', 'bs4'])
+def test_stream_head_only(site_session, backend):
+    for mode in ('pep', 'whats-new'):
+        function = main.MODE_TO_FUNCTION[mode]
+        assert function(
+            site_session, Namespace(backend=backend, stream=True)
+        ) == function(site_session, Namespace(backend=backend))
+
+
+def test_main_stops_log_listener(monkeypatch, caplog):
+    class Listener:
+        stopped = False
+
+        def stop(self):
+            self.stopped = True
+
+    def interrupt(cli_args):
+        raise KeyboardInterrupt
+
+    listener = Listener()
+    monkeypatch.setattr('sys.argv', ['main.py', 'all'])
+    monkeypatch.setattr(main, 'configure_logging', lambda args: listener)
+    monkeypatch.setattr(main, 'run_session', interrupt)
+    caplog.set_level('INFO')
+    with pytest.raises(KeyboardInterrupt):
+        main.main()
+    assert listener.stopped
+    # В лог попадают аргументы до замены режима all списком режимов
+    assert [
+        record.args['mode'] for record in caplog.records
+        if record.msg == main.PARSER_ARGS_MESSAGE
+    ] == [['all']]
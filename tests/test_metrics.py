@@ -0,0 +1,40 @@
+import json
+from argparse import Namespace
+from pathlib import Path
+
+try:
+    from src import main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+import metrics
+
+
+def test_metrics_summary(monkeypatch, tmp_path, site_session):
+    monkeypatch.setattr(metrics, 'BASE_DIR', Path(tmp_path))
+    metrics.METRICS.reset()
+    cli_args = Namespace(mode='pep', profile=True)
+    with metrics.profiling(cli_args):
+        main.pep(site_session)
+        main.pep(site_session)
+    summary = json.loads(
+        metrics.write_metrics(cli_args, transport={}).read_text()
+    )
+    assert summary['phases']['pep']['calls'] == 2
+    assert summary['phases']['pep_status_lxml']['calls'] == 6
+    assert summary['counters']['cache_miss'] == 4
+    assert summary['counters']['cache_hit'] == 4
+    assert summary['counters']['bytes_fetched'] > 0
+    assert summary['tracemalloc']['peak_bytes'] > 0
+    assert summary['peak_rss_kb'] > 0
+    assert Path(summary['profile']).exists()
+
+
+def test_bytes_fetched_counts_network_only(site_session):
+    metrics.METRICS.reset()
+    main.pep(site_session)
+    fetched = metrics.METRICS.counters['bytes_fetched']
+    main.pep(site_session)
+    assert metrics.METRICS.counters['cache_hit'] == 4
+    assert metrics.METRICS.counters['bytes_fetched'] == fetched > 0
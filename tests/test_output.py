@@ -90,3 +90,129 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_file_output_streams_rows(monkeypatch, tmp_path):
+    mock_base_dir = Path(tmp_path)
+    monkeypatch.setattr(outputs, 'BASE_DIR', mock_base_dir)
+    written = []
+
+    def rows():
+        yield ('Статус', 'Количество')
+        yield ('Active', 2)
+        written.extend(
+            (mock_base_dir / 'results').glob('*.csv')
+        )
+        written.append(written[0].read_text(encoding='utf-8'))
+        raise ConnectionError('breathtaken')
+
+    with pytest.raises(ConnectionError):
+        outputs.control_output(rows(), cli_args('pep', 'file'))
+    assert written[1] == '"Статус","Количество"\n"Active","2"\n'
+
+
+@pytest.mark.parametrize('output_format', [None, 'pretty'])
+def test_control_output_generator(capsys, records, output_format):
+    rows = records('pep')
+    outputs.control_output(iter(rows), cli_args('pep', output_format))
+    captured_out, _ = capsys.readouterr()
+    assert 'Active' in captured_out
+
+
+def test_control_output_sqlite(monkeypatch, tmp_path, records):
+    import sqlite3
+    import warehouse
+    monkeypatch.setattr(warehouse, 'BASE_DIR', Path(tmp_path))
+    rows = records('pep')
+    outputs.control_output(rows, cli_args('pep', 'sqlite'))
+    outputs.control_output(rows, cli_args('pep', 'sqlite'))
+    connection = sqlite3.connect(str(tmp_path / 'results.sqlite'))
+    got = connection.execute(
+        'SELECT run_id, COUNT(*) FROM rows WHERE mode = ? GROUP BY run_id',
+        ('pep',)
+    ).fetchall()
+    connection.close()
+    assert got == [(1, len(rows) - 1), (2, len(rows) - 1)]
+
+
+def test_control_output_jsonl(monkeypatch, tmp_path, records):
+    import json
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    rows = records('whats-new')
+    outputs.control_output(rows, cli_args('whats-new', 'jsonl'))
+    output_file, = Path(tmp_path).glob('results/*.jsonl')
+    lines = output_file.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == len(rows) - 1
+    assert json.loads(lines[0]) == dict(zip(rows[0], rows[1]))
+
+
+def test_control_output_diff(monkeypatch, tmp_path, capsys, records):
+    import warehouse
+    monkeypatch.setattr(warehouse, 'BASE_DIR', Path(tmp_path))
+    rows = records('pep')
+    args = cli_args('pep', None)
+    args.diff = True
+    outputs.control_output(rows, args)
+    outputs.control_output(rows, args)
+    captured_out, _ = capsys.readouterr()
+    assert captured_out.count('added') == len(rows) - 1
+    assert captured_out.splitlines()[-1] == 'Изменение ' + ' '.join(rows[0])
+
+
+def test_render_table():
+    rows = [
+        ('Статус', 'Количество'),
+        ('Active', 2),
+        ('Very long\nstatus value', 10),
+    ]
+    assert outputs.render_table(rows, max_width=12) == [
+        'Статус       | Количество',
+        '-------------+-----------',
+        'Active       | 2',
+        'Very long s… | 10',
+    ]
+
+
+def test_control_output_table(capsys, records):
+    rows = records('pep')
+    outputs.control_output(iter(rows), Namespace(
+        mode='pep', output='table', limit=2, page_size=1, max_width=20,
+        pager=True
+    ))
+    captured_out, _ = capsys.readouterr()
+    pages = captured_out.split('\n\n')
+    assert len(pages) == 2
+    assert [page.splitlines()[2].split()[::2] for page in pages] == [
+        ['Active', '36'], ['Superseded', '15']
+    ]
+    assert rows[3][0] not in captured_out
+
+
+def test_limit_rows_stops_reading():
+    read = []
+
+    def rows():
+        yield ('Статус', 'Количество')
+        for number in range(100):
+            read.append(number)
+            yield ('Active', number)
+
+    got = list(outputs.limit_rows(rows(), Namespace(limit=3)))
+    assert got[0] == ('Статус', 'Количество')
+    assert len(got) == 4
+    assert read == [0, 1, 2]
+
+
+def test_control_output_diff_limit(monkeypatch, tmp_path, capsys, records):
+    import warehouse
+    monkeypatch.setattr(warehouse, 'BASE_DIR', Path(tmp_path))
+    rows = records('pep')
+    args = cli_args('pep', 'table')
+    args.diff = True
+    args.limit = 2
+    outputs.control_output(iter(rows), args)
+    # Запуск сохранён целиком: во втором запуске изменений нет
+    args.limit = None
+    outputs.control_output(iter(rows), args)
+    captured_out, _ = capsys.readouterr()
+    assert captured_out.count('added') == 2
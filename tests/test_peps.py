@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+try:
+    from src import peps
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `peps.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `peps.py`'
+from exceptions import PepApiException, PepIndexNotFoundException
+
+FIXTURE_DIR = Path(__file__).parent / 'fixture_data'
+
+
+@pytest.fixture
+def pep_index():
+    return peps.PepIndex([
+        peps.PepRecord(1, 'PEP Purpose', ['Warsaw', 'Hylton'], 'Process',
+                       'Active', 'https://peps.python.org/pep-0001/'),
+        peps.PepRecord(8, 'Style Guide', ['GvR', 'Warsaw'],
+                       'Standards Track', 'Active',
+                       'https://peps.python.org/pep-0008/'),
+        peps.PepRecord(695, 'Type Parameter Syntax', ['Traut'],
+                       'Standards Track', 'Final',
+                       'https://peps.python.org/pep-0695/'),
+    ])
+
+
+def numbers(records):
+    return [record.number for record in records]
+
+
+def test_record_is_compact():
+    record = peps.PepRecord(1, '', [], 'Process', 'Active', '')
+    assert not hasattr(record, '__dict__')
+
+
+def test_query(pep_index):
+    assert numbers(pep_index.query()) == [1, 8, 695]
+    assert numbers(pep_index.query(status='active')) == [1, 8]
+    assert numbers(pep_index.query(
+        status='Active', author='Warsaw', type='Standards Track'
+    )) == [8]
+    assert numbers(pep_index.query(number=695, status='Final')) == [695]
+    assert pep_index.query(number=695, status='Active') == []
+    assert pep_index.query(number=9999) == []
+    assert pep_index.query(author='Nobody') == []
+
+
+def test_count_by(pep_index):
+    assert peps.count_by(pep_index.query(), 'author') == {
+        'Warsaw': 2, 'Hylton': 1, 'GvR': 1, 'Traut': 1
+    }
+    assert peps.count_by(pep_index.query(type='Standards Track'),
+                         'status') == {'Active': 1, 'Final': 1}
+
+
+def test_save_load(pep_index, tmp_path):
+    path = pep_index.save(tmp_path / 'index.json')
+    loaded = peps.PepIndex.load(path)
+    assert [record.as_row() for record in loaded.records] == [
+        record.as_row() for record in pep_index.records
+    ]
+    assert numbers(loaded.query(author='gvr')) == [8]
+    with pytest.raises(PepIndexNotFoundException):
+        peps.PepIndex.load(tmp_path / 'missing.json')
+
+
+def test_read_api_records():
+    text = (FIXTURE_DIR / 'peps.json').read_text(encoding='utf-8')
+    records = peps.read_api_records(text)
+    assert numbers(records) == [1, 8, 695]
+    assert records[1].authors == ('Guido van Rossum', 'Barry Warsaw')
+    assert records[2].status == 'Accepted'
+    with pytest.raises(PepApiException):
+        peps.read_api_records('{"1": {"number": 1}}')
+    with pytest.raises(PepApiException):
+        peps.read_api_records('<html></html>')
+
+
+def test_compare_records(pep_index):
+    text = (FIXTURE_DIR / 'peps.json').read_text(encoding='utf-8')
+    api_records = peps.read_api_records(text)
+    assert list(peps.compare_records(pep_index.records, api_records)) == [
+        (1, 'title', 'PEP Purpose', 'PEP Purpose and Guidelines'),
+        (8, 'title', 'Style Guide', 'Style Guide for Python Code'),
+        (695, 'status', 'Final', 'Accepted'),
+    ]
+    assert list(peps.compare_records([], api_records[:1])) == [
+        (1, 'title', None, 'PEP Purpose and Guidelines'),
+        (1, 'type', None, 'Process'),
+        (1, 'status', None, 'Active'),
+        (1, 'url', None, 'https://peps.python.org/pep-0001/'),
+    ]
@@ -0,0 +1,64 @@
+import time
+
+try:
+    from src import ratelimit
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `ratelimit.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `ratelimit.py`'
+
+
+def test_limiter_grows_while_healthy():
+    limiter = ratelimit.HostLimiter(max_concurrency=8, rate=0)
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert limiter.state()['limit'] == 8
+    assert limiter.state()['in_flight'] == 0
+
+
+def test_limiter_backs_off_when_throttled():
+    limiter = ratelimit.HostLimiter(max_concurrency=8, rate=0)
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.01)
+    limiter.acquire()
+    limiter.release(0.01, throttled=True)
+    assert limiter.state()['limit'] == 4
+    assert limiter.state()['throttled'] == 1
+    limiter.acquire()
+    limiter.release(0.01, throttled=True)
+    assert limiter.state()['limit'] == 4
+
+
+def test_limiter_backs_off_on_rising_latency():
+    limiter = ratelimit.HostLimiter(max_concurrency=8, rate=0)
+    for _ in range(100):
+        limiter.acquire()
+        limiter.release(0.01)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(1.0)
+    assert limiter.state()['limit'] < 8
+
+
+def test_limiter_token_bucket():
+    limiter = ratelimit.HostLimiter(max_concurrency=1, rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+        limiter.release(0)
+    assert time.monotonic() - start >= 0.09
+    assert limiter.state()['waits'] >= 4
+
+
+def test_limiter_recovers_when_latency_stabilises():
+    limiter = ratelimit.HostLimiter(max_concurrency=8, rate=0)
+    # Один быстрый ответ (например, 304) не задаёт базу навсегда
+    limiter.acquire()
+    limiter.release(0.001)
+    for _ in range(300):
+        limiter.acquire()
+        limiter.release(0.5)
+    assert limiter.state()['base_latency_ms'] == 500
+    assert limiter.state()['limit'] == 8
@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from argparse import Namespace
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+try:
+    from src import main, service
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `service.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `service.py`'
+
+
+@pytest.fixture
+def results(site_session):
+    calls = []
+
+    def pep(session, cli_args):
+        calls.append(cli_args.mode)
+        return main.pep(session, cli_args)
+
+    def broken(session, cli_args):
+        raise ConnectionError('нет сети')
+
+    results = service.ResultsCache(
+        site_session, Namespace(parse_store=False),
+        {'pep': pep, 'broken': broken}
+    )
+    results.calls = calls
+    return results
+
+
+@pytest.fixture
+def server_url(results):
+    server = service.make_server(results, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+
+def get_json(url):
+    try:
+        with urlopen(url, timeout=10) as response:
+            return response.status, json.load(response)
+    except HTTPError as error:
+        return error.code, json.load(error)
+
+
+def test_results_are_kept_in_memory(results, server_url):
+    assert get_json(server_url) == (200, {'pep': None, 'broken': None})
+    status, payload = get_json(server_url + 'pep')
+    assert status == 200
+    assert payload['mode'] == 'pep'
+    assert payload['rows'][0] == list(main.PEPS_HEAD)
+    assert payload['rows'][-1] == [main.PEPS_TAIL, 3]
+    assert get_json(server_url + 'pep')[1] == payload
+    assert results.calls == ['pep']
+    assert get_json(server_url)[1]['pep'] == payload['updated']
+
+
+def test_errors(server_url):
+    status, payload = get_json(server_url + 'broken')
+    assert status == 503
+    assert payload == {'error': 'нет сети'}
+    status, payload = get_json(server_url + 'download')
+    assert status == 404
+    assert 'download' in payload['error']
+
+
+def test_background_refresh(results):
+    results.refresh = 0.01
+    results.start()
+    try:
+        deadline = time.monotonic() + 10
+        while len(results.calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        results.stop()
+    assert len(results.calls) >= 2
+    assert results.get('pep')['rows'][0] == main.PEPS_HEAD
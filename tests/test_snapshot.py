@@ -0,0 +1,80 @@
+import requests
+try:
+    from src import snapshot
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshot.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshot.py`'
+from src import main
+from transport import mount_replay
+
+
+def test_snapshot_roundtrip(tmp_path):
+    path = tmp_path / 'site.snapshot'
+    writer = snapshot.SnapshotWriter(path)
+    writer.add('https://docs.python.org/3/', 200, {'ETag': '"v1"'}, b'docs')
+    writer.add('https://peps.python.org/', 404, {}, b'')
+    writer.close()
+    writer.close()
+    reader = snapshot.SnapshotReader(path)
+    assert len(reader) == 2
+    assert reader['https://docs.python.org/3/'] == (
+        200, {'ETag': '"v1"'}, b'docs'
+    )
+    assert reader['https://peps.python.org/'] == (404, {}, b'')
+
+
+def test_replay_pep_from_snapshot(tmp_path, site_session):
+    from tests.fixture_data.pages import site_pages
+    path = tmp_path / 'site.snapshot'
+    writer = snapshot.SnapshotWriter(path)
+    for url, text in site_pages().items():
+        writer.add(url, 200, {}, text.encode('utf-8'))
+    writer.close()
+    session = requests.Session()
+    mount_replay(session, snapshot.SnapshotReader(path))
+    assert main.pep(session) == main.pep(site_session)
+    assert main.whats_new(session) == main.whats_new(site_session)
+
+
+def test_recording_skips_partial_responses(monkeypatch, tmp_path):
+    import transport
+
+    def send(adapter, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 206 if 'Range' in request.headers else 200
+        response._content = b'archive'
+        return response
+
+    monkeypatch.setattr(transport.TransportAdapter, 'send', send)
+    path = tmp_path / 'site.snapshot'
+    adapter = snapshot.RecordingAdapter(snapshot.SnapshotWriter(path), 1, 0)
+    url = 'https://docs.python.org/3/archives/docs.zip'
+    adapter.send(requests.Request('GET', url, headers={
+        'Range': 'bytes=3-'
+    }).prepare())
+    adapter.close()
+    assert url not in snapshot.SnapshotReader(path)
+
+
+def test_replay_download_ignores_range(tmp_path):
+    import io
+    import zipfile
+
+    from utils import download_file
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('python.pdf', 'You are breathtaken' * 1000)
+    content = buffer.getvalue()
+    url = 'https://docs.python.org/3/archives/docs.zip'
+    path = tmp_path / 'site.snapshot'
+    writer = snapshot.SnapshotWriter(path)
+    writer.add(url, 200, {'Content-Length': str(len(content))}, content)
+    writer.close()
+    session = requests.Session()
+    mount_replay(session, snapshot.SnapshotReader(path))
+    archive_path = tmp_path / 'docs.zip'
+    archive_path.write_bytes(content[:100])
+    assert download_file(session, url, archive_path)
+    assert archive_path.read_bytes() == content
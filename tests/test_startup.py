@@ -0,0 +1,53 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve(strict=True).parent.parent / 'src'
+# Бюджет на импорт main.py с запасом для медленных машин CI;
+# с загрузкой requests_cache, bs4 и lxml импорт занимал ~340 мс
+IMPORT_BUDGET_US = 150_000
+HEAVY_MODULES = (
+    'bs4', 'http.server', 'lxml', 'prettytable', 'requests', 'requests_cache',
+    'tqdm',
+)
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=SRC_DIR,
+        capture_output=True, text=True, check=True
+    )
+
+
+def test_heavy_modules_are_lazy():
+    loaded = run_python(
+        '-c',
+        'import sys, main; '
+        f'print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules])'
+    ).stdout.split()
+    assert not loaded, (
+        f'Модули {loaded} загружаются при импорте main.py, '
+        'импортируйте их в функциях, которые их используют'
+    )
+
+
+def test_import_time_budget():
+    stderr = run_python('-X', 'importtime', '-c', 'import main').stderr
+    match = re.search(r'\|\s*(\d+)\s*\|\s*main$', stderr, re.MULTILINE)
+    if match is None:
+        pytest.skip('Интерпретатор не поддерживает -X importtime')
+    cumulative = int(match.group(1))
+    assert cumulative < IMPORT_BUDGET_US, (
+        f'Импорт main.py занимает {cumulative // 1000} мс, '
+        f'бюджет - {IMPORT_BUDGET_US // 1000} мс'
+    )
+
+
+def test_help_does_not_create_logs():
+    logs = SRC_DIR / 'logs'
+    existed = logs.exists()
+    run_python('main.py', '-h')
+    assert existed or not logs.exists()
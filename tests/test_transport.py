@@ -0,0 +1,72 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+try:
+    from src import transport
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    failures = 2
+
+    def do_GET(self):
+        if FlakyHandler.failures:
+            FlakyHandler.failures -= 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = b'You are breathtaken'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    FlakyHandler.failures = 2
+    server = HTTPServer(('127.0.0.1', 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+
+def test_transport_retries_server_errors(monkeypatch, flaky_server):
+    monkeypatch.setattr(transport, 'BACKOFF_JITTER', 0)
+    session = requests.Session()
+    adapter = transport.mount_transport(session, concurrency=2)
+    adapter.max_retries.backoff_factor = 0.01
+    response = session.get(flaky_server)
+    assert response.status_code == 200
+    assert response.text == 'You are breathtaken'
+    stats = adapter.stats.as_dict()
+    assert stats['retries'] == 2
+    assert stats['pool_waits'] == 0
+    host, = stats['hosts']
+    assert stats['hosts'][host]['throttled'] == 1
+    assert stats['hosts'][host]['in_flight'] == 0
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 2
+
+
+def test_replay_adapter():
+    session = requests.Session()
+    url = 'https://docs.python.org/3/'
+    transport.mount_replay(session, {
+        url: (200, {'ETag': '"v1"'}, b'You are breathtaken')
+    })
+    response = session.get(url)
+    assert response.text == 'You are breathtaken'
+    assert response.headers['etag'] == '"v1"'
+    with pytest.raises(requests.ConnectionError):
+        session.get(url + 'unexisting_page/')
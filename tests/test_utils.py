@@ -54,3 +54,168 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_iter_responses_keeps_order(mock_session):
+    urls = [f'{MAIN_DOC_URL}page_{number}/' for number in range(20)]
+    with requests_mock.Mocker(session=mock_session) as mock:
+        for url in urls:
+            mock.get(url, text=url)
+        mock.get(
+            urls[3], exc=requests.exceptions.ConnectionError('breathtaken')
+        )
+        got = list(utils.iter_responses(mock_session, urls, concurrency=5))
+    assert len(got) == len(urls)
+    assert isinstance(got[3], ConnectionError)
+    assert [
+        response.text for response in got if not isinstance(
+            response, ConnectionError
+        )
+    ] == urls[:3] + urls[4:]
+
+
+def test_iter_responses_window(mock_session):
+    urls = [f'{MAIN_DOC_URL}page_{number}/' for number in range(20)]
+    with requests_mock.Mocker(session=mock_session) as mock:
+        for url in urls:
+            mock.get(url, text=url)
+        responses = utils.iter_responses(
+            mock_session, urls, concurrency=2, window=3
+        )
+        next(responses)
+        # Без window все запросы отправляются сразу
+        assert mock.call_count <= 4
+        got = [next(responses).text for _ in urls[1:]]
+    assert got == urls[1:]
+
+
+def test_get_response_head_tags(mock_session):
+    url = MAIN_DOC_URL + 'whatsnew/3.12.html'
+    page = (
+        '<html><body><h1>Title</h1><dl><dt>Editor</dt><dd>Guido</dd></dl>'
+        + '<p>Lorem ipsum</p>' * 5000 + '</body></html>'
+    )
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', url, text=page)
+    mock_session.mount('https://', adapter)
+    with mock_session.cache_disabled():
+        got = utils.get_response(mock_session, url, head_tags=('dl',))
+    assert '</dl>' in got.text
+    assert len(got.content) < len(page)
+    # Ответ, записываемый в кеш, сохраняется целиком
+    got = utils.get_response(mock_session, url, head_tags=('h1', 'dl'))
+    assert len(got.content) < len(page)
+    cached = mock_session.get(url)
+    assert cached.from_cache
+    assert cached.text == page
+    assert adapter.call_count == 2
+
+
+@pytest.fixture
+def zip_content(tmp_path):
+    import zipfile
+    archive_path = tmp_path / 'source.zip'
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        archive.writestr('python.pdf', 'You are breathtaken' * 1000)
+    return archive_path.read_bytes()
+
+
+def test_download_file_resumes_and_skips(mock_session, tmp_path, zip_content):
+    url = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    # Недокачанный файл прерванной загрузки версии "v1"
+    path.write_bytes(zip_content[:100])
+    path.with_name(path.name + '.etag').write_text('"v1"')
+    headers = {'Content-Length': str(len(zip_content)), 'ETag': '"v1"'}
+    with requests_mock.Mocker(session=mock_session) as mock:
+        mock.head(url, headers=headers)
+        mock.get(url, content=zip_content[100:], status_code=206)
+        assert utils.download_file(mock_session, url, path)
+        assert mock.last_request.headers['Range'] == 'bytes=100-'
+        assert mock.last_request.headers['If-Range'] == '"v1"'
+        assert path.read_bytes() == zip_content
+        assert not utils.download_file(mock_session, url, path)
+        assert mock.call_count == 3
+    assert not mock_session.cache.contains(url=url)
+
+
+def test_download_file_new_version(mock_session, tmp_path, zip_content):
+    import io
+    import zipfile
+
+    url = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('python.pdf', 'You are breathtaken' * 5000)
+    new_content = buffer.getvalue()
+    assert len(new_content) > len(zip_content)
+    with requests_mock.Mocker(session=mock_session) as mock:
+        mock.head(url, headers={
+            'Content-Length': str(len(zip_content)), 'ETag': '"v1"'
+        })
+        mock.get(url, content=zip_content)
+        assert utils.download_file(mock_session, url, path)
+        # На сервере новая версия архива большего размера
+        mock.head(url, headers={
+            'Content-Length': str(len(new_content)), 'ETag': '"v2"'
+        })
+
+        def serve_v2(request, context):
+            # Сервер отдаёт хвост, если If-Range совпадает с его ETag
+            if request.headers.get('If-Range') == '"v2"':
+                context.status_code = 206
+                offset = int(request.headers['Range'][6:-1])
+                return new_content[offset:]
+            return new_content
+
+        mock.get(url, content=serve_v2)
+        assert utils.download_file(mock_session, url, path)
+        assert 'Range' not in mock.last_request.headers
+        assert path.read_bytes() == new_content
+        assert not utils.download_file(mock_session, url, path)
+
+
+def test_download_file_full(mock_session, tmp_path, zip_content):
+    url = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    headers = {'Content-Length': str(len(zip_content)), 'ETag': '"v1"'}
+    with requests_mock.Mocker(session=mock_session) as mock:
+        mock.head(url, headers=headers)
+        mock.get(url, content=zip_content)
+        for local in (zip_content[:100], zip_content):
+            path.write_bytes(local)
+            assert utils.download_file(mock_session, url, path, full=True)
+            assert 'Range' not in mock.last_request.headers
+            assert path.read_bytes() == zip_content
+
+
+def test_download_file_broken_archive(mock_session, tmp_path):
+    url = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+    path = tmp_path / 'python-docs-pdf-a4.zip'
+    with requests_mock.Mocker(session=mock_session) as mock:
+        mock.head(url)
+        mock.get(url, content=b'You are breathtaken')
+        with pytest.raises(BaseException) as excinfo:
+            utils.download_file(mock_session, url, path)
+    assert excinfo.typename == 'ArchiveIntegrityException'
+    assert not path.exists()
+
+
+def test_get_response_deduplicates_in_flight(mock_session):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    url = MAIN_DOC_URL + 'slow_page/'
+
+    def slow_text(request, context):
+        time.sleep(0.2)
+        return 'You are breathtaken'
+
+    with requests_mock.Mocker(session=mock_session) as mock:
+        mock.get(url, text=slow_text)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            got = list(executor.map(
+                lambda _: utils.get_response(mock_session, url), range(4)
+            ))
+        assert mock.call_count == 1
+    assert {response.text for response in got} == {'You are breathtaken'}